@@ -0,0 +1,207 @@
+"""
+asyncio-native CourtListener client.
+
+Mirrors ``CourtListenerScraper`` on top of an ``httpx.AsyncClient`` with a
+shared connection pool and HTTP/2 keep-alive, so hundreds of detail/text
+requests can be in flight at once without an OS thread each.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+import httpx
+
+from config import (
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_KEEPALIVE,
+    COURTLISTENER_API_BASE,
+    COURTS,
+    LOOKBACK_DAYS,
+    MAX_RETRIES,
+    SEARCH_FIELDS,
+    USER_AGENT,
+)
+from rate_limiter import RETRY_STATUSES, RateLimiter
+from scraper import ACCEPT_ENCODING, CourtListenerScraper, Opinion, courtlistener_url, extract_opinion_text
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCourtListenerScraper:
+    """Fetches opinions from CourtListener API using asyncio."""
+
+    # Parsing is pure, so share it with the requests-based scraper.
+    _resolve_court = staticmethod(CourtListenerScraper._resolve_court)
+    _parse_search_result = CourtListenerScraper._parse_search_result
+    _filed_after = CourtListenerScraper._filed_after
+    _advance_high_water = CourtListenerScraper._advance_high_water
+    _log_transfer_stats = CourtListenerScraper._log_transfer_stats
+
+    def __init__(
+        self, api_token: str = "", rate_limiter: RateLimiter | None = None, high_water: dict | None = None
+    ):
+        self.api_token = api_token or os.environ.get("COURTLISTENER_API_TOKEN", "")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+        if self.api_token:
+            headers["Authorization"] = f"Token {self.api_token}"
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE,
+            ),
+        )
+        self.cutoff_date = datetime.now() - timedelta(days=LOOKBACK_DAYS)
+        self.high_water = high_water if high_water is not None else {}
+        self.bytes_on_wire = 0
+        self.bytes_decoded = 0
+
+    async def __aenter__(self) -> "AsyncCourtListenerScraper":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def scrape_all_courts(self) -> list[Opinion]:
+        """Fetch recent opinions from all configured Florida courts concurrently."""
+        results = await asyncio.gather(
+            *(self._scrape_court(court_id, court_config) for court_id, court_config in COURTS.items())
+        )
+        all_opinions = [opinion for opinions in results for opinion in opinions]
+        logger.info(f"Total opinions fetched: {len(all_opinions)}")
+        self._log_transfer_stats()
+        return all_opinions
+
+    async def _scrape_court(self, court_id: str, court_config: dict) -> list[Opinion]:
+        """Fetch a single court, logging (rather than raising) any failure."""
+        try:
+            logger.info(f"Fetching {court_config['name']}...")
+            opinions = await self._fetch_court_opinions(court_id, court_config)
+            logger.info(f"  Found {len(opinions)} opinions from {court_config['short_name']}")
+            return opinions
+        except Exception as e:
+            logger.error(f"  Error fetching {court_config['name']}: {e}")
+            return []
+
+    async def _get(self, url: str, params: dict | None = None, timeout: int = 30) -> httpx.Response:
+        """Issue a GET request through the shared rate limiter, retrying like the sync scraper."""
+        for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.acquire_async()
+            try:
+                response = await self.client.get(url, params=params, timeout=timeout)
+            except httpx.TransportError as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                logger.warning(f"  {type(e).__name__} — retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})")
+                await asyncio.sleep(delay)
+                continue
+
+            retry_after = self.rate_limiter.observe(response.headers)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                self.bytes_on_wire += response.num_bytes_downloaded
+                self.bytes_decoded += len(response.content)
+                return response
+
+            delay = self.rate_limiter.backoff(attempt, retry_after)
+            logger.warning(
+                f"  HTTP {response.status_code} — retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})"
+            )
+            if response.status_code == 429:
+                self.rate_limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+
+        return response
+
+    async def _fetch_court_opinions(self, court_id: str, config: dict) -> list[Opinion]:
+        """Fetch opinions for a single court using the search endpoint."""
+        opinions = []
+        url = f"{COURTLISTENER_API_BASE}/search/"
+        params = {
+            "type": "o",  # opinions
+            "court": config["cl_id"],
+            "filed_after": self._filed_after(court_id).strftime("%Y-%m-%d"),
+            "order_by": "dateFiled desc",
+            "format": "json",
+        }
+        if SEARCH_FIELDS:
+            params["fields"] = ",".join(SEARCH_FIELDS)
+
+        page_count = 0
+        while url and page_count < 10:  # Safety limit: max 10 pages
+            try:
+                response = await self._get(url, params=params if page_count == 0 else None, timeout=30)
+                response.raise_for_status()
+                data = response.json()
+
+                results = data.get("results", [])
+                if not results:
+                    break
+
+                for result in results:
+                    opinion = self._parse_search_result(result, court_id, config)
+                    if opinion:
+                        opinions.append(opinion)
+
+                # Follow pagination
+                url = data.get("next")
+                params = None  # Next URL already has params
+                page_count += 1
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 400:
+                    logger.error(f"  400 Bad Request. Response: {e.response.text[:500]}")
+                    break
+                raise
+
+        self._advance_high_water(court_id, opinions)
+        return opinions
+
+    async def _fetch_opinion_text(self, opinion_url: str) -> tuple[str, str]:
+        """Fetch the text content of an individual opinion."""
+        try:
+            if not opinion_url.startswith("http"):
+                opinion_url = f"https://www.courtlistener.com{opinion_url}"
+
+            response = await self._get(opinion_url, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+
+            text = extract_opinion_text(data)
+            pdf_url = courtlistener_url(data.get("download_url", "") or "")
+
+            return text, pdf_url
+        except Exception as e:
+            logger.debug(f"Error fetching opinion text: {e}")
+            return "", ""
+
+    async def fetch_opinion_texts(
+        self, opinion_urls: list[str], max_in_flight: int = ASYNC_MAX_CONNECTIONS
+    ) -> list[tuple[str, str]]:
+        """Fetch many opinion detail URLs concurrently, preserving input order."""
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def fetch(url: str) -> tuple[str, str]:
+            async with semaphore:
+                return await self._fetch_opinion_text(url)
+
+        return await asyncio.gather(*(fetch(url) for url in opinion_urls))
+
+
+async def scrape_opinions_async(high_water: dict | None = None) -> list[Opinion]:
+    """Async entry point: fetch all courts and return opinions."""
+    async with AsyncCourtListenerScraper(high_water=high_water) as scraper:
+        return await scraper.scrape_all_courts()
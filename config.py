@@ -43,5 +43,131 @@ RSS_LANGUAGE = "en"
 # How many days back to look for opinions
 LOOKBACK_DAYS = 7
 
+# CourtListener's published API quota (5,000 requests/hour per authenticated user).
+# All workers share one token bucket refilled at this rate.
+COURTLISTENER_RATE_LIMIT = 5000
+COURTLISTENER_RATE_PERIOD = 3600  # seconds
+RATE_LIMIT_BURST = 10  # bucket capacity
+
+# Retries for 429 / 5xx / connection errors (exponential backoff with jitter)
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 60.0  # seconds
+
+# How many courts to fetch in parallel (1 = sequential)
+MAX_CONCURRENT_COURTS = 4
+
+# Search result fields actually read by the scraper; the API is asked to return
+# only these. Set to () to request full result objects.
+SEARCH_FIELDS = (
+    "caseName",
+    "dateFiled",
+    "docketNumber",
+    "judge",
+    "citation",
+    "status",
+    "cluster_id",
+    "absolute_url",
+    "download_url",
+    "snippet",
+)
+
+# Parse search pages incrementally as they download (flat memory for large
+# backfill pages). Pages are then fetched without prefetch.
+STREAM_SEARCH_PAGES = False
+
+# Search pages to download ahead while the current page is parsed (0 = no prefetch)
+PREFETCH_PAGES = 1
+
+# On-disk HTTP cache for CourtListener responses (revalidated with ETag /
+# If-Modified-Since). Least-recently-used entries are evicted past the size cap.
+HTTP_CACHE_DIR = ".cache/http"
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Full-text hydration of new opinions: clusters per batched opinions-endpoint
+# request, and worker threads for clusters the batch lookup misses
+HYDRATE_BATCH_SIZE = 50
+HYDRATE_MAX_WORKERS = 4
+
+# PDF text extraction for opinions without API text: pages to read, parser
+# processes (None = one per CPU), and the content-hash keyed text cache
+PDF_MAX_PAGES = 30
+PDF_EXTRACT_PROCESSES = None
+PDF_TEXT_CACHE_DIR = ".cache/pdf_text"
+PDF_TEXT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Local store of full opinion text (compressed blobs keyed by content hash,
+# indexed by cluster id). Least-recently-used texts are evicted past the cap
+TEXT_STORE_DIR = ".cache/texts"
+TEXT_STORE_MAX_BYTES = 100 * 1024 * 1024
+
+# Connection pool limits for the asyncio client (async_scraper.py)
+ASYNC_MAX_CONNECTIONS = 100
+ASYNC_MAX_KEEPALIVE = 20
+
+# Once a court has a high-water mark (newest filing date seen), only this many
+# days before it are re-requested, to pick up late-indexed opinions/corrections
+HIGH_WATER_OVERLAP_DAYS = 3
+
+# Seen IDs are kept for the lookback window plus this margin (by filing date),
+# then dropped from the state store
+STATE_RETENTION_MARGIN_DAYS = 30
+
+# state.json saves append to state.json.journal; the snapshot is rewritten (and
+# the journal cleared) after this many journaled saves
+STATE_SNAPSHOT_EVERY = 20
+
+# While opinions move through the pipeline, state is checkpointed after this
+# many have advanced a stage
+PIPELINE_CHECKPOINT_EVERY = 10
+
+# Optional on-disk seen-ID index (Bloom filter + sorted ID file) for long
+# backfills; "" disables it. Files are written as <path>.bloom and <path>.ids
+SEEN_INDEX_PATH = ""
+SEEN_INDEX_FALSE_POSITIVE_RATE = 0.001
+
 # User agent for requests
 USER_AGENT = "FloridaCourtOpinionRSS/1.0 (GitHub Pages RSS Feed Generator)"
+
+# Claude summarization: at most this many requests in flight (1 = one at a
+# time). The limit adapts to the anthropic-ratelimit-* response headers,
+# assuming roughly SUMMARY_TOKENS_PER_REQUEST input tokens per call.
+SUMMARY_MAX_CONCURRENCY = 8
+SUMMARY_TOKENS_PER_REQUEST = 5000
+
+# --batch-summaries: poll the Message Batch every SUMMARY_BATCH_POLL_INTERVAL
+# seconds; after SUMMARY_BATCH_DEADLINE seconds it is canceled and the rest
+# are summarized synchronously. Requests that already succeeded are billed, so
+# after canceling we wait up to SUMMARY_BATCH_CANCEL_WAIT seconds for the batch
+# to end and keep their results
+SUMMARY_BATCH_DEADLINE = 30 * 60
+SUMMARY_BATCH_POLL_INTERVAL = 30
+SUMMARY_BATCH_CANCEL_WAIT = 2 * 60
+
+# Mark the fixed summary system prompt (and any few-shot examples) as
+# cacheable, so repeated calls in a run read it from Anthropic's prompt cache
+SUMMARY_PROMPT_CACHING = False
+
+# Summaries memoized by hash(normalized opinion text + model + prompt version);
+# entries expire after SUMMARY_CACHE_TTL_DAYS and the least recently used are
+# evicted past SUMMARY_CACHE_MAX_ENTRIES. None disables the cache. Texts
+# shorter than SUMMARY_CACHE_MIN_CHARS (boilerplate orders shared by unrelated
+# cases, whose summaries name the parties) are never memoized
+SUMMARY_CACHE_PATH = ".cache/summaries.json"
+SUMMARY_CACHE_MAX_ENTRIES = 5000
+SUMMARY_CACHE_TTL_DAYS = 180
+SUMMARY_CACHE_MIN_CHARS = 2000
+
+# Give PCAs, citation-only affirmances, dismissals and errata a templated
+# summary instead of sending them to Claude
+SUMMARY_RULE_BASED = True
+
+# Opinions longer than SUMMARY_TOKEN_BUDGET (estimated at ~4 characters per
+# token) are split at section boundaries into parts of about
+# SUMMARY_CHUNK_TOKENS, summarized concurrently, and the part summaries are
+# combined. Parts grow so one opinion takes about SUMMARY_MAX_CHUNKS requests
+# at most. With SUMMARY_MAP_REDUCE off, long opinions are truncated instead.
+SUMMARY_MAP_REDUCE = True
+SUMMARY_TOKEN_BUDGET = 3000
+SUMMARY_CHUNK_TOKENS = 3000
+SUMMARY_MAX_CHUNKS = 8
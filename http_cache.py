@@ -0,0 +1,177 @@
+"""
+Persistent HTTP response cache for the CourtListener session.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` validator are stored on
+disk, keyed by the full request URL (which includes the query parameters,
+so a search whose ``filed_after`` moved is a different entry).
+Later requests for the same URL are sent as conditional GETs; a ``304 Not
+Modified`` reply is answered from disk, so the body is never downloaded
+twice. The cache is bounded in size and evicts least-recently-used entries.
+The index is written by ``flush()``, once per run, not on every hit.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Headers kept alongside a cached body (the body is stored already decoded)
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class HTTPCache:
+    """Size-bounded, LRU-evicted store of response bodies and their validators."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.hits = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable HTTP cache index: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def lookup(self, url: str) -> dict | None:
+        """Return the index entry for ``url`` (validators and headers), if cached."""
+        with self._lock:
+            return self._index.get(self.key(url))
+
+    def read(self, url: str) -> bytes | None:
+        """Read a cached body and mark it as recently used."""
+        key = self.key(url)
+        try:
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except OSError:
+            with self._lock:
+                if self._index.pop(key, None) is not None:
+                    self._dirty = True
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index[key]["last_used"] = time.time()
+                self.hits += 1
+                self._dirty = True
+        return body
+
+    def store(self, url: str, headers, body: bytes):
+        """Save a response body with its validators, evicting old entries as needed."""
+        if len(body) > self.max_bytes:
+            return
+        key = self.key(url)
+        tmp_path = f"{self._body_path(key)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+
+        with self._lock:
+            self._index[key] = {
+                "url": url,
+                "headers": {name: headers[name] for name in _STORED_HEADERS if name in headers},
+                "size": len(body),
+                "last_used": time.time(),
+            }
+            self.stores += 1
+            self._evict()
+            self._dirty = True
+
+    def flush(self):
+        """Write the index to disk if it changed."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+                self._dirty = False
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            del self._index[key]
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Transport adapter that revalidates GETs against an ``HTTPCache``."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET":
+            return super().send(request, stream=stream, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        if entry:
+            if "ETag" in entry["headers"]:
+                request.headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                request.headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry:
+            body = self.cache.read(request.url)
+            if body is not None:
+                response.close()
+                return self._cached_response(request, entry, body)
+        elif response.status_code == 200 and not stream and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            self.cache.store(request.url, response.headers, response.content)
+
+        return response
+
+    def _cached_response(self, request, entry: dict, body: bytes) -> requests.Response:
+        """Build a ``200 OK`` response from a cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response.from_cache = True
+        return response
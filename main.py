@@ -13,19 +13,34 @@ Usage:
     python main.py --output-dir ./docs      # Custom output directory
     python main.py --lookback 14            # Override lookback days
     python main.py --github-url https://user.github.io/repo  # Set GitHub Pages URL
+    python main.py --async-client           # Fetch with the asyncio/HTTP2 client
+    python main.py --no-http-cache          # Don't reuse cached CourtListener responses
+    python main.py --full-refresh           # Re-fetch the whole lookback window
+    python main.py --compact-state          # Drop expired state entries and exit
+    python main.py --batch-summaries        # Summarize via the Message Batches API
 """
 
 import argparse
-import json
+import itertools
 import logging
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from config import LOOKBACK_DAYS
+from config import LOOKBACK_DAYS, HTTP_CACHE_DIR, SEEN_INDEX_PATH, SUMMARY_PROMPT_CACHING
 from scraper import scrape_opinions, FloridaCourtScraper
-from summarizer import summarize_all
+from seen_index import SeenIndex
+from state import (
+    FETCHED,
+    PUBLISHED,
+    SUMMARIZED,
+    TEXT_HYDRATED,
+    SQLiteStateStore,
+    open_state_store,
+    track_progress,
+)
+from summarizer import OpinionSummarizer
 from feed_generator import generate_feed
 
 logging.basicConfig(
@@ -38,35 +53,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_seen_opinions(state_file: str) -> set[str]:
-    """Load previously seen opinion IDs to avoid re-processing."""
-    if not os.path.exists(state_file):
-        return set()
-    try:
-        with open(state_file) as f:
-            data = json.load(f)
-            return set(data.get("seen_ids", []))
-    except Exception:
-        return set()
-
-
-def save_seen_opinions(state_file: str, seen_ids: set[str]):
-    """Save seen opinion IDs for deduplication."""
-    with open(state_file, "w") as f:
-        json.dump({
-            "seen_ids": list(seen_ids),
-            "last_updated": datetime.now().isoformat(),
-        }, f, indent=2)
-
-
 def main():
     parser = argparse.ArgumentParser(description="Florida Court Opinion RSS Feed Generator")
     parser.add_argument("--no-summarize", action="store_true", help="Skip AI summarization")
     parser.add_argument("--output-dir", default="docs", help="Output directory for feed files")
     parser.add_argument("--lookback", type=int, default=LOOKBACK_DAYS, help="Days to look back")
     parser.add_argument("--github-url", default="", help="GitHub Pages base URL")
-    parser.add_argument("--state-file", default="state.json", help="State file for deduplication")
+    parser.add_argument("--state-file", default="state.json", help="State file for deduplication (.json, or .db for SQLite)")
+    parser.add_argument("--import-state", default="", help="Import a state.json into the SQLite --state-file first")
+    parser.add_argument("--seen-index", default=SEEN_INDEX_PATH, help="Path prefix of an on-disk Bloom filter + sorted ID index for seen checks")
+    parser.add_argument("--compact-state", action="store_true", help="Drop expired state entries, compact the state file, and exit")
     parser.add_argument("--api-key", default="", help="Anthropic API key (or use ANTHROPIC_API_KEY env var)")
+    parser.add_argument("--batch-summaries", action="store_true", help="Summarize through the Message Batches API (for backfills and heavy release days)")
+    parser.add_argument("--prompt-caching", action="store_true", help="Cache the fixed summary prompt with Anthropic prompt caching")
+    parser.add_argument("--async-client", action="store_true", help="Fetch with the asyncio/HTTP2 CourtListener client")
+    parser.add_argument("--no-http-cache", action="store_true", help="Disable the on-disk CourtListener response cache")
+    parser.add_argument("--full-refresh", action="store_true", help="Ignore high-water marks and re-fetch the whole lookback window")
     args = parser.parse_args()
 
     # Override lookback if specified
@@ -84,46 +86,122 @@ def main():
     logger.info(f"Summarization: {'OFF' if args.no_summarize else 'ON'}")
     logger.info("=" * 60)
 
-    # Step 1: Scrape opinions
+    store = open_state_store(args.state_file, args.lookback)
+    if args.import_state:
+        if not isinstance(store, SQLiteStateStore):
+            parser.error("--import-state requires a SQLite --state-file (e.g. state.db)")
+        store.import_json(args.import_state)
+
+    if args.compact_state:
+        removed = store.compact()
+        store.close()
+        logger.info(f"Compacted {args.state_file}: dropped {removed} expired entries")
+        return
+
+    # Large backfills check seen IDs against the on-disk index instead of the store
+    seen_index = None
+    is_seen = store.is_seen
+    if args.seen_index:
+        seen_index = SeenIndex(args.seen_index)
+        if not len(seen_index):
+            seen_index.add(store.seen_ids())
+        is_seen = seen_index.__contains__
+
+    # Opinions a failed or interrupted earlier run didn't get through are resumed first
+    cutoff = datetime.now() - timedelta(days=args.lookback)
+    unfinished = store.unfinished(cutoff)
+    resumed = [o for o, status in unfinished if status in (FETCHED, TEXT_HYDRATED)]
+    for o in resumed:
+        if not o.text_content:
+            o.text_source = ""  # full text isn't kept in state; hydrate it again (from the local text store)
+        # A stored search snippet is kept as the fallback if hydration finds nothing better
+    if unfinished:
+        logger.info(f"Resuming {len(unfinished)} unfinished opinions ({len(resumed)} still to summarize)")
+
+    # Step 1: Scrape opinions (only those newer than each court's high-water mark).
+    # The marks are copied so checkpoints don't persist them before the run finishes.
+    high_water = {} if args.full_refresh else dict(store.high_water)
+    run_ids = {o.unique_id for o, _ in unfinished}
     logger.info("\n📋 Step 1: Scraping opinions from all courts...")
-    opinions = scrape_opinions()
-
-    if not opinions:
+    scraper = FloridaCourtScraper(
+        cache_dir=None if args.no_http_cache else HTTP_CACHE_DIR,
+        high_water=high_water,
+    )
+    if args.async_client:
+        fetched = iter(scrape_opinions(use_async=True, high_water=high_water))
+    else:
+        fetched = scraper.iter_opinions()
+
+    # Step 2: Deduplicate against previously seen opinions as they stream in
+    opinions = []
+    new_opinions = []
+
+    def new_only():
+        for o in fetched:
+            opinions.append(o)
+            if o.unique_id not in run_ids and not is_seen(o.unique_id):
+                run_ids.add(o.unique_id)
+                new_opinions.append(o)
+                store.record([o])  # recorded as FETCHED
+                yield o
+
+    new_stream = new_only()
+
+    # Step 3: Summarize (if enabled) while later pages are still being fetched.
+    # Each opinion's stage is recorded as it advances, with periodic checkpoints.
+    api_key = args.api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+    if not args.no_summarize and api_key:
+        logger.info("\n🤖 Step 2: Summarizing new opinions with Claude as they arrive...")
+        try:
+            # Search snippets are a few hundred characters; pull full text in batches
+            # first, then fall back to the PDF for anything the API has no text for
+            work = itertools.chain(resumed, new_stream)
+            hydrated = track_progress(scraper.extract_pdf_texts(scraper.hydrate_texts(work)), store, TEXT_HYDRATED)
+            summarizer = OpinionSummarizer(api_key=api_key, prompt_caching=args.prompt_caching or SUMMARY_PROMPT_CACHING)
+            if args.batch_summaries:
+                # A batch needs the whole set up front, so fetching finishes first
+                results = summarizer.summarize_batch(list(hydrated), scraper)
+            else:
+                results = summarizer.iter_summaries(hydrated, scraper)
+            summarized = track_progress(results, store, SUMMARIZED, done=lambda o: bool(o.summary))
+            for _ in summarized:
+                pass
+            summarizer.log_usage()
+        except Exception as e:
+            logger.error(f"Summarization failed: {e}")
+            logger.info("Continuing without summaries; unsummarized opinions are retried next run...")
+    elif not args.no_summarize:
+        logger.warning("No ANTHROPIC_API_KEY found. Skipping summarization.")
+
+    # Finish fetching whatever the summarizer didn't consume
+    for _ in new_stream:
+        pass
+    logger.info(f"Found {len(new_opinions)} new opinions (out of {len(opinions)} fetched)")
+
+    # Opinions fetched by earlier runs are still part of the feed's lookback window
+    feed_opinions = {o.unique_id: o for o in store.recent_opinions(cutoff)}
+    feed_opinions.update((o.unique_id, o) for o in opinions)
+
+    if not feed_opinions:
         logger.warning("No opinions found. The feed will be empty.")
         # Still generate the feed (it'll be empty but valid)
 
-    # Step 2: Deduplicate against previously seen opinions
-    seen_ids = load_seen_opinions(args.state_file)
-    new_opinions = [o for o in opinions if o.unique_id not in seen_ids]
-    logger.info(f"Found {len(new_opinions)} new opinions (out of {len(opinions)} total)")
-
-    # Update seen IDs
-    for o in opinions:
-        seen_ids.add(o.unique_id)
-    save_seen_opinions(args.state_file, seen_ids)
-
-    # Step 3: Summarize (if enabled)
-    if not args.no_summarize and new_opinions:
-        api_key = args.api_key or os.environ.get("ANTHROPIC_API_KEY", "")
-        if api_key:
-            logger.info(f"\n🤖 Step 2: Summarizing {len(new_opinions)} new opinions with Claude...")
-            try:
-                new_opinions = summarize_all(new_opinions, api_key=api_key)
-            except Exception as e:
-                logger.error(f"Summarization failed: {e}")
-                logger.info("Continuing without summaries...")
-        else:
-            logger.warning("No ANTHROPIC_API_KEY found. Skipping summarization.")
-
-    # Merge: use all opinions (new + previously seen with summaries from prior runs)
-    # For feed generation, we use whatever we have
-    all_feed_opinions = opinions  # Use all scraped opinions for the feed
-
-    # Apply summaries from new_opinions to matching items in all_feed_opinions
-    summary_map = {o.unique_id: o.summary for o in new_opinions if o.summary}
+    store.record(opinions)
+    store.high_water = high_water
+    store.save()
+    if seen_index is not None:
+        added = seen_index.add(o.unique_id for o in opinions)
+        logger.info(f"Seen index: {added} IDs added, {seen_index.probes} lookups needed the sorted ID file")
+        seen_index.close()
+
+    # Merge: use all opinions (newly fetched + recent ones carried over from prior runs)
+    all_feed_opinions = list(feed_opinions.values())
+
+    # Previously seen opinions keep the summaries stored by the run that made them
+    stored_summaries = store.summaries(o.unique_id for o in all_feed_opinions if not o.summary)
     for o in all_feed_opinions:
-        if o.unique_id in summary_map:
-            o.summary = summary_map[o.unique_id]
+        if not o.summary and o.unique_id in stored_summaries:
+            o.summary = stored_summaries[o.unique_id]
 
     # Step 4: Generate feeds
     logger.info(f"\n📰 Step 3: Generating RSS feed with {len(all_feed_opinions)} opinions...")
@@ -133,6 +211,15 @@ def main():
         github_pages_url=github_url,
     )
 
+    # Opinions still missing a summary (while summarizing is on) stay unfinished for the next run
+    summarizing = not args.no_summarize and bool(api_key)
+    store.record(
+        (o for o in all_feed_opinions if o.unique_id in run_ids and (o.summary or not summarizing)),
+        PUBLISHED,
+    )
+    store.save()
+    store.close()
+
     logger.info("\n✅ Done!")
     logger.info(f"Feed: {feed_path}")
     logger.info(f"Index: {os.path.join(args.output_dir, 'index.html')}")
@@ -0,0 +1,150 @@
+"""
+Rule-based recognition of opinions that need no model to summarize.
+
+Most DCA output is boilerplate: per curiam affirmances without opinion
+(PCAs), affirmances that only cite authority, dismissals, and errata. These
+are recognized from ``opinion_type`` and the shape of the opinion body, and
+get a deterministic templated summary instead of a Claude call.
+
+Body rules only apply to full text (API or PDF); a search snippet is short
+whatever the opinion says, so it is never taken as evidence of a PCA.
+"""
+
+import re
+
+from scraper import Opinion
+
+PCA = "pca"
+CITATION_AFFIRMANCE = "citation_affirmance"
+DISMISSAL = "dismissal"
+ERRATA = "errata"
+
+# Bodies longer than this (characters between "PER CURIAM" and the
+# concurrence line) are treated as substantive whatever they start with
+_MAX_CITATION_BODY = 800
+_MAX_DISMISSAL_BODY = 400
+
+_PER_CURIAM_RE = re.compile(r"\bPER\s+CURIAM\b\.?", re.IGNORECASE)
+_CONCUR_RE = re.compile(r"\bconcur", re.IGNORECASE)
+_AFFIRMED_RE = re.compile(r"^affirmed\.?\s*", re.IGNORECASE)
+_DISMISSED_RE = re.compile(
+    r"^(?:(?:the\s+)?(?:appeal|petition|cause)(?:\s+(?:is|for\s+\w+(?:\s+\w+){0,2}\s+is))?\s+)?dismissed\b\.?\s*",
+    re.IGNORECASE,
+)
+_CITATION_RE = re.compile(r"^(?:see\b|cf\.|accord\b|citing\b)", re.IGNORECASE)
+# A citation sentence ends at the close of its parenthetical ("... (Fla. 2009).")
+_CITATION_END_RE = re.compile(r"(?<=\))\.\s+")
+_PARENTHETICAL_RE = re.compile(r"\([^()]*\)")
+# The court's own words, as opposed to a citation
+_PROSE_RE = re.compile(r"\b(?:we|our|however|note|because|although)\b", re.IGNORECASE)
+# Anything beyond a plain affirmance or dismissal needs the model
+_DISPOSITION_RE = re.compile(r"\b(?:remand|revers|vacat|grant|certif)", re.IGNORECASE)
+_ERRATA_RE = re.compile(r"^\s*(?:errata|erratum|notice of correction)\b", re.IGNORECASE)
+# After the panel line: a dissent or a concurrence that comes with its own opinion
+_SEPARATE_OPINION_RE = re.compile(r"\bdissent|\bspecially\b|\bwith\s+opinion\b|\bconcurring\b", re.IGNORECASE)
+
+
+def _split_body(text: str) -> tuple[str, str] | None:
+    """``(body, rest)`` around the concurrence line that follows the last "PER CURIAM"."""
+    matches = list(_PER_CURIAM_RE.finditer(text))
+    if not matches:
+        return None
+    body = text[matches[-1].end():]
+    concur = _CONCUR_RE.search(body)
+    if concur:
+        return body[:concur.start()], body[concur.start():]
+    return body, ""
+
+
+def _body(text: str) -> str | None:
+    """Text between the last "PER CURIAM" and the concurrence line, whitespace-normalized."""
+    split = _split_body(text)
+    return " ".join(split[0].split()) if split else None
+
+
+def _judges_only(rest: str) -> bool:
+    """True if ``rest`` is just a panel list like "LEWIS, ROWE, and NORDBY, JJ.,"."""
+    return not re.search(r"[a-z]{2,}", re.sub(r"\band\b", "", rest))
+
+
+def _panel_stripped(rest: str) -> str:
+    """``rest`` without a trailing panel list ("LEWIS, ROWE, and NORDBY, JJ.,") left before "concur"."""
+    return re.sub(r"\s+[A-Z][A-Z.,'\s]*(?:\band\b[A-Z.,'\s]*)?(?:JJ?|C\.J)\.?,?\s*$", "", rest)
+
+
+def _citations_only(rest: str) -> bool:
+    """True if ``rest`` is nothing but citation sentences ("See ...; ... (Fla. 2009). Cf. ...")."""
+    sentences = [s for s in _CITATION_END_RE.split(rest.strip()) if s.strip()]
+    if not sentences or not all(_CITATION_RE.match(s.strip()) for s in sentences):
+        return False
+    stripped = rest
+    for _ in range(2):  # nested parentheticals
+        stripped = _PARENTHETICAL_RE.sub("", stripped)
+    return not _PROSE_RE.search(stripped)
+
+
+def classify_opinion(opinion: Opinion, text: str = "") -> str | None:
+    """Return ``PCA``, ``CITATION_AFFIRMANCE``, ``DISMISSAL``, ``ERRATA``, or None for substantive opinions."""
+    text = text or opinion.text_content
+    if opinion.opinion_type == "Errata" or (text and _ERRATA_RE.match(text)):
+        return ERRATA
+    if not text or opinion.text_source == "snippet":
+        return None
+
+    split = _split_body(text)
+    if split is None:
+        return None
+    # A written dissent or special concurrence makes it substantive (and reviewable)
+    if _SEPARATE_OPINION_RE.search(split[1]):
+        return None
+    body = " ".join(split[0].split())
+
+    affirmed = _AFFIRMED_RE.match(body)
+    if affirmed:
+        rest = body[affirmed.end():]
+        if _judges_only(rest):
+            return PCA
+        if (
+            len(rest) <= _MAX_CITATION_BODY
+            and not _DISPOSITION_RE.search(rest)
+            and _citations_only(_panel_stripped(rest))
+        ):
+            return CITATION_AFFIRMANCE
+        return None
+
+    dismissed = _DISMISSED_RE.match(body)
+    if dismissed and len(body) <= _MAX_DISMISSAL_BODY and not _DISPOSITION_RE.search(body):
+        return DISMISSAL
+    return None
+
+
+def _cited_authority(text: str) -> str:
+    body = _body(text) or ""
+    affirmed = _AFFIRMED_RE.match(body)
+    rest = body[affirmed.end():] if affirmed else body
+    return _panel_stripped(rest).strip().rstrip(".")
+
+
+def templated_summary(opinion: Opinion, kind: str, text: str = "") -> str:
+    """Deterministic summary for an opinion classified by ``classify_opinion``."""
+    court, case = opinion.court_name, opinion.case_name
+    if kind == PCA:
+        return (
+            f"Per Curiam Affirmed (PCA): the {court} affirmed the decision below in {case} "
+            f"without a written opinion. A PCA states no reasoning, has no precedential value, "
+            f"and generally cannot be reviewed by the Florida Supreme Court."
+        )
+    if kind == CITATION_AFFIRMANCE:
+        return (
+            f"The {court} affirmed the decision below in {case} in a per curiam opinion that only "
+            f"cites authority ({_cited_authority(text or opinion.text_content)}). "
+            f"There is no written analysis; the cited authority indicates the basis for the affirmance."
+        )
+    if kind == DISMISSAL:
+        return (
+            f"The {court} dismissed the proceeding in {case} without reaching the merits "
+            f"in a written opinion."
+        )
+    if kind == ERRATA:
+        return f"Errata: a correction to a previously issued opinion in {case} ({opinion.case_number})."
+    raise ValueError(f"Unknown opinion kind: {kind}")
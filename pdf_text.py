@@ -0,0 +1,70 @@
+"""
+PDF text extraction for opinions that have no text in the CourtListener API.
+
+Parsing runs in worker processes (it is CPU-bound), and extracted text is
+cached on disk by the SHA-256 of the PDF bytes, so a PDF that has been
+parsed once is never parsed again. The cache is bounded in size; the least
+recently used files are deleted first.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pdf_file(path: str, max_pages: int) -> str:
+    """Extract the text of the first ``max_pages`` pages (runs in a worker process)."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    pages = reader.pages[:max_pages]
+    return "\n".join(page.extract_text() or "" for page in pages).strip()
+
+
+class PDFTextCache:
+    """Extracted PDF text on disk, keyed by PDF content hash and page limit."""
+
+    def __init__(self, cache_dir: str, max_bytes: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, digest: str, max_pages: int) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.p{max_pages}.txt")
+
+    def get(self, digest: str, max_pages: int) -> str | None:
+        path = self._path(digest, max_pages)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mtime doubles as last-used time for eviction
+            return text
+        except OSError:
+            return None
+
+    def put(self, digest: str, max_pages: int, text: str):
+        path = self._path(digest, max_pages)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """Delete the least recently used files until the cache fits ``max_bytes``."""
+        if self.max_bytes is None:
+            return
+        files = [entry for entry in os.scandir(self.cache_dir) if entry.is_file()]
+        total = sum(entry.stat().st_size for entry in files)
+        removed = 0
+        for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            logger.info(f"PDF text cache: deleted {removed} files past the {self.max_bytes} byte cap")
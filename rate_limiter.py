@@ -0,0 +1,248 @@
+"""
+Shared rate limiters for CourtListener and Anthropic API requests.
+
+One limiter instance is shared by every worker thread (or asyncio task), so
+fetching several courts concurrently still respects a single, global request
+budget.
+
+The limiter is a token bucket sized from CourtListener's published quota. It
+is also fed by the server's responses: ``Retry-After`` pauses every worker for
+exactly as long as the server asks, and ``X-RateLimit-*`` headers (when sent)
+keep the bucket from promising more requests than the server will allow.
+
+Summarization uses ``ConcurrencyLimiter`` instead: it caps how many Claude
+requests are in flight and sizes that cap from the ``anthropic-ratelimit-*``
+headers, so throughput grows to the account's limits and backs off near them.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    COURTLISTENER_RATE_LIMIT,
+    COURTLISTENER_RATE_PERIOD,
+    RATE_LIMIT_BURST,
+    SUMMARY_MAX_CONCURRENCY,
+    SUMMARY_TOKENS_PER_REQUEST,
+)
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by all threads and asyncio tasks."""
+
+    def __init__(
+        self,
+        rate: float = COURTLISTENER_RATE_LIMIT / COURTLISTENER_RATE_PERIOD,
+        burst: int = RATE_LIMIT_BURST,
+    ):
+        self.rate = rate  # tokens per second
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Tokens may go negative: each caller queues behind earlier reservations.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """Block the calling thread until it may send a request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Hold every caller for ``seconds`` (e.g. after a 429) and drain the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+
+    def observe(self, headers) -> float | None:
+        """
+        Update the bucket from a response's rate-limit headers.
+
+        Returns the server-requested ``Retry-After`` delay in seconds, if any.
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        if remaining is not None:
+            with self._lock:
+                self._refill(time.monotonic())
+                self._tokens = min(self._tokens, remaining)
+            if remaining <= 0 and retry_after is None:
+                retry_after = _parse_reset(headers.get("X-RateLimit-Reset"))
+
+        return retry_after
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before retry number ``attempt`` (see ``backoff_delay``)."""
+        return backoff_delay(attempt, retry_after)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight requests, adapting the cap to the server's remaining quota.
+
+    After each response the cap shrinks to what the remaining requests and
+    tokens (at ``tokens_per_request`` each) can cover, or grows by one
+    (additive increase) while there is headroom. A 429 halves the cap and
+    pauses every caller.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+        tokens_per_request: int = SUMMARY_TOKENS_PER_REQUEST,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_request = tokens_per_request
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+
+    def acquire(self):
+        """Block until fewer than ``limit`` requests are in flight and no pause is active."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self.limit:
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold every caller for ``seconds`` and halve the concurrency cap."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.limit = max(1, self.limit // 2)
+            self._cond.notify_all()
+
+    def observe(self, headers):
+        """Resize the cap from a response's ``anthropic-ratelimit-*`` headers."""
+        requests_remaining = _parse_float(headers.get("anthropic-ratelimit-requests-remaining"))
+        tokens_remaining = [
+            value for value in (
+                _parse_float(headers.get("anthropic-ratelimit-tokens-remaining")),
+                _parse_float(headers.get("anthropic-ratelimit-input-tokens-remaining")),
+            )
+            if value is not None
+        ]
+
+        headroom = self.max_concurrency
+        if requests_remaining is not None:
+            headroom = min(headroom, int(requests_remaining))
+        if tokens_remaining:
+            headroom = min(headroom, int(min(tokens_remaining) // self.tokens_per_request))
+
+        with self._cond:
+            if headroom < 1:
+                # Quota exhausted: wait for the earliest window to reset
+                resets = [
+                    _parse_timestamp(headers.get(f"anthropic-ratelimit-{kind}-reset"))
+                    for kind in ("requests", "tokens", "input-tokens")
+                ]
+                resets = [r for r in resets if r is not None]
+                wait = min(resets) if resets else BACKOFF_BASE
+                self._paused_until = max(self._paused_until, time.monotonic() + wait)
+                self.limit = 1
+            elif headroom < self.limit:
+                self.limit = headroom
+            elif self.limit < headroom:
+                self.limit += 1
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        return backoff_delay(attempt, retry_after)
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """
+    Delay before retry number ``attempt`` (0-based).
+
+    Honors the server's ``Retry-After`` with only a small jitter on top;
+    otherwise uses capped exponential backoff with full jitter.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, BACKOFF_BASE)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """``X-RateLimit-Reset`` may be a delay in seconds or a Unix timestamp."""
+    reset = _parse_float(value)
+    if reset is None:
+        return None
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    """Seconds until an RFC 3339 timestamp (as sent in ``anthropic-ratelimit-*-reset``)."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _parse_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
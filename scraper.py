@@ -7,20 +7,63 @@ the CourtListener REST API v4 (courtlistener.com).
 No web scraping needed — this uses a clean JSON API.
 """
 
+import hashlib
 import logging
+import multiprocessing
 import os
+import queue
+import re
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import ijson
 import requests
-
-from config import COURTS, COURTLISTENER_API_BASE, USER_AGENT, LOOKBACK_DAYS, DCA_PREFIX_MAP
+from bs4 import BeautifulSoup
+from urllib3.util import make_headers
+
+from config import (
+    COURTS,
+    COURTLISTENER_API_BASE,
+    USER_AGENT,
+    LOOKBACK_DAYS,
+    DCA_PREFIX_MAP,
+    MAX_CONCURRENT_COURTS,
+    MAX_RETRIES,
+    PREFETCH_PAGES,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HIGH_WATER_OVERLAP_DAYS,
+    SEARCH_FIELDS,
+    STREAM_SEARCH_PAGES,
+    HYDRATE_BATCH_SIZE,
+    HYDRATE_MAX_WORKERS,
+    PDF_MAX_PAGES,
+    PDF_EXTRACT_PROCESSES,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_CACHE_MAX_BYTES,
+    TEXT_STORE_DIR,
+    TEXT_STORE_MAX_BYTES,
+)
+from http_cache import CachingHTTPAdapter, HTTPCache
+from pdf_text import PDFTextCache, extract_pdf_file
+from text_store import TextStore
+from rate_limiter import RETRY_STATUSES, RateLimiter
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
+# Marks the end of a page stream (or of one court's opinion stream)
+_END_OF_STREAM = object()
+
+# Every content coding we can decode (gzip/deflate, plus br/zstd when installed)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
 
 @dataclass
 class Opinion:
@@ -39,48 +82,316 @@ class Opinion:
     docket_number: str = ""
     citation: str = ""
     judges: str = ""
+    cluster_id: str = ""
+    text_source: str = ""  # "snippet", "api" or "pdf"
 
     @property
     def unique_id(self) -> str:
-        return f"{self.court_id}:{self.case_number or self.docket_number}"
+        """
+        Canonical ID: ``fl:<normalized docket>``, or ``cl:<cluster id>`` when there is no docket.
+
+        The docket is preferred because CourtListener files the same opinion
+        under more than one court (and cluster), e.g. ``3dca`` and ``fladistctapp``.
+        """
+        docket = canonical_docket(self.case_number or self.docket_number, self.court_id)
+        if docket:
+            return f"fl:{docket}"
+        if self.cluster_id:
+            return f"cl:{self.cluster_id}"
+        return f"{self.court_id}:"
+
+    def to_dict(self, include_text: bool = True) -> dict:
+        """Serialize to JSON-compatible types (for the state file)."""
+        data = asdict(self)
+        data["date"] = self.date.strftime("%Y-%m-%d")
+        if not include_text:
+            data["text_content"] = ""
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Opinion":
+        """Inverse of ``to_dict``; unknown keys are ignored."""
+        fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        fields["date"] = datetime.strptime(fields["date"], "%Y-%m-%d")
+        return cls(**fields)
+
+
+# Docket prefix implied by a CourtListener court id, for dockets filed without one
+_COURT_DOCKET_PREFIXES = {
+    "fla": "SC",
+    "florida_supreme_court": "SC",
+    **{f"{n}dca": f"{n}D" for n in range(1, 7)},
+    **{f"fladistctapp{n}": f"{n}D" for n in range(1, 7)},
+}
+
+_DOCKET_RE = re.compile(r"^(SC|[1-6]D)(\d{2}|\d{4})-(\d+)$")
+
+
+def canonical_docket(docket: str, court_id: str = "") -> str:
+    """
+    Normalize a Florida appellate docket number to ``<prefix><yyyy>-<nnnn>``.
+
+    ``3D25-192``, ``2025-0192`` (filed under ``3dca``) and ``3d2025-0192`` all
+    become ``3D2025-0192``. For consolidated cases (``SC2025-1 & SC2025-2``)
+    the first docket is used. Dockets that don't look Florida-shaped are
+    returned cleaned up but otherwise unchanged.
+    """
+    docket = re.split(r"[&,;]| and ", docket.strip().upper(), maxsplit=1)[0]
+    docket = re.sub(r"\s+", "", docket)
+    if not docket:
+        return ""
+    if docket[:1].isdigit() and docket[1:2] != "D" and court_id.lower() in _COURT_DOCKET_PREFIXES:
+        docket = _COURT_DOCKET_PREFIXES[court_id.lower()] + docket
+    match = _DOCKET_RE.match(docket)
+    if not match:
+        return docket
+    prefix, year, number = match.groups()
+    if len(year) == 2:
+        year = f"20{year}"
+    return f"{prefix}{year}-{int(number):04d}"
+
+
+def canonical_opinion_id(opinion_id: str) -> str:
+    """Map an ID in any earlier ``<court>:<docket>`` form to the canonical ``Opinion.unique_id``."""
+    court_id, _, docket = opinion_id.partition(":")
+    if court_id in ("fl", "cl") or not docket:
+        return opinion_id
+    return f"fl:{canonical_docket(docket, court_id)}"
+
+
+def _recency(opinion: Opinion) -> tuple:
+    """Sort key for "newest": filing date, then cluster id."""
+    return opinion.date, int(opinion.cluster_id) if opinion.cluster_id.isdigit() else 0
+
+
+def extract_opinion_text(data: dict) -> str:
+    """Best available text of an opinion API object (HTML variants are stripped to text)."""
+    if data.get("plain_text"):
+        return data["plain_text"]
+    for field in ("html_with_citations", "html", "html_lawbox", "html_columbia", "html_anon_2020"):
+        if data.get(field):
+            return BeautifulSoup(data[field], "lxml").get_text().strip()
+    return ""
+
+
+def courtlistener_url(url: str) -> str:
+    """Make a site-relative CourtListener path absolute."""
+    if url and not url.startswith("http"):
+        return f"https://www.courtlistener.com{url}"
+    return url
+
+
+class _CountingReader:
+    """File-like wrapper that counts the (decoded) bytes read through it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
 
 
 class CourtListenerScraper:
     """Fetches opinions from CourtListener API."""
 
-    def __init__(self, api_token: str = ""):
+    def __init__(
+        self,
+        api_token: str = "",
+        rate_limiter: RateLimiter | None = None,
+        prefetch_pages: int = PREFETCH_PAGES,
+        cache_dir: str | None = HTTP_CACHE_DIR,
+        high_water: dict | None = None,
+        stream_pages: bool = STREAM_SEARCH_PAGES,
+    ):
         self.api_token = api_token or os.environ.get("COURTLISTENER_API_TOKEN", "")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.prefetch_pages = prefetch_pages
+        self.stream_pages = stream_pages
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": USER_AGENT,
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
         })
         if self.api_token:
             self.session.headers["Authorization"] = f"Token {self.api_token}"
+        # Revalidate repeat requests against an on-disk cache (ETag / Last-Modified)
+        self.http_cache = HTTPCache(cache_dir, HTTP_CACHE_MAX_BYTES) if cache_dir else None
+        if self.http_cache:
+            self.session.mount("https://", CachingHTTPAdapter(self.http_cache))
         self.cutoff_date = datetime.now() - timedelta(days=LOOKBACK_DAYS)
-
-    def scrape_all_courts(self) -> list[Opinion]:
-        """Fetch recent opinions from all configured Florida courts."""
+        # Per-court {"date_filed", "cluster_id"} of the newest opinion seen so far.
+        # Updated in place, so callers can persist the dict they passed in.
+        self.high_water = high_water if high_water is not None else {}
+        # Response bytes as transferred vs. after decompression
+        self.bytes_on_wire = 0
+        self.bytes_decoded = 0
+        self._stats_lock = threading.Lock()
+        self.pdf_cache = PDFTextCache(PDF_TEXT_CACHE_DIR, PDF_TEXT_CACHE_MAX_BYTES)
+        self.text_store = TextStore(TEXT_STORE_DIR, TEXT_STORE_MAX_BYTES)
+
+    def scrape_all_courts(self, max_workers: int = MAX_CONCURRENT_COURTS) -> list[Opinion]:
+        """
+        Fetch recent opinions from all configured Florida courts.
+
+        Courts are fetched in parallel (up to ``max_workers`` at a time); every
+        request still goes through the shared rate limiter. Results keep the
+        order of ``COURTS``.
+        """
         all_opinions = []
+        workers = max(1, min(max_workers, len(COURTS)))
 
-        for court_id, court_config in COURTS.items():
-            try:
-                logger.info(f"Fetching {court_config['name']}...")
-                opinions = self._fetch_court_opinions(court_id, court_config)
-                all_opinions.extend(opinions)
-                logger.info(f"  Found {len(opinions)} opinions from {court_config['short_name']}")
-                time.sleep(0.5)  # Rate limiting
-            except Exception as e:
-                logger.error(f"  Error fetching {court_config['name']}: {e}")
+        if workers == 1:
+            results = [self._scrape_court(court_id, court_config) for court_id, court_config in COURTS.items()]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="court") as pool:
+                results = list(pool.map(lambda item: self._scrape_court(*item), COURTS.items()))
+
+        for opinions in results:
+            all_opinions.extend(opinions)
 
         logger.info(f"Total opinions fetched: {len(all_opinions)}")
+        self._log_run_stats()
         return all_opinions
 
+    def iter_opinions(self, max_workers: int = MAX_CONCURRENT_COURTS) -> Iterator[Opinion]:
+        """
+        Yield opinions from all configured courts as soon as each page is parsed.
+
+        The streaming counterpart of ``scrape_all_courts``: with more than one
+        worker, courts are fetched on background threads, so the caller can
+        process (dedupe, summarize) opinions while later pages are still
+        downloading. Opinions from different courts arrive interleaved.
+        """
+        workers = max(1, min(max_workers, len(COURTS)))
+        total = 0
+
+        if workers == 1:
+            for court_id, court_config in COURTS.items():
+                for opinion in self._iter_court_logged(court_id, court_config):
+                    total += 1
+                    yield opinion
+        else:
+            opinions = queue.Queue()
+
+            def produce(court_id: str, court_config: dict):
+                try:
+                    for opinion in self._iter_court_logged(court_id, court_config):
+                        opinions.put(opinion)
+                finally:
+                    opinions.put(_END_OF_STREAM)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="court") as pool:
+                for court_id, court_config in COURTS.items():
+                    pool.submit(produce, court_id, court_config)
+                remaining = len(COURTS)
+                while remaining:
+                    item = opinions.get()
+                    if item is _END_OF_STREAM:
+                        remaining -= 1
+                        continue
+                    total += 1
+                    yield item
+
+        logger.info(f"Total opinions fetched: {total}")
+        self._log_run_stats()
+
+    def _log_run_stats(self):
+        self._log_transfer_stats()
+        if self.http_cache:
+            logger.info(
+                f"HTTP cache: {self.http_cache.hits} responses served from disk (304), "
+                f"{self.http_cache.stores} stored"
+            )
+            self.http_cache.flush()
+
+    def _scrape_court(self, court_id: str, court_config: dict) -> list[Opinion]:
+        """Fetch a single court, logging (rather than raising) any failure."""
+        return list(self._iter_court_logged(court_id, court_config))
+
+    def _iter_court_logged(self, court_id: str, court_config: dict) -> Iterator[Opinion]:
+        """Stream a single court's opinions, logging (rather than raising) any failure."""
+        count = 0
+        try:
+            logger.info(f"Fetching {court_config['name']}...")
+            for opinion in self._iter_court_opinions(court_id, court_config):
+                count += 1
+                yield opinion
+            logger.info(f"  Found {count} opinions from {court_config['short_name']}")
+        except Exception as e:
+            logger.error(f"  Error fetching {court_config['name']}: {e}")
+
+    def _record_transfer(self, wire_bytes: int, decoded_bytes: int):
+        with self._stats_lock:
+            self.bytes_on_wire += wire_bytes
+            self.bytes_decoded += decoded_bytes
+
+    def _log_transfer_stats(self):
+        if not self.bytes_decoded:
+            return
+        saved = 100 * (1 - self.bytes_on_wire / self.bytes_decoded)
+        logger.info(
+            f"Transferred {self.bytes_on_wire / 1024:.1f} KB for {self.bytes_decoded / 1024:.1f} KB "
+            f"of JSON ({saved:.0f}% saved by compression and cache)"
+        )
+
+    def _get(
+        self, url: str, params: dict | None = None, timeout: int = 30, stream: bool = False
+    ) -> requests.Response:
+        """
+        Issue a GET request through the shared rate limiter.
+
+        429s, 5xx responses and connection errors are retried up to
+        ``MAX_RETRIES`` times. A 429 pauses every worker for the server's
+        ``Retry-After``; other failures back off exponentially with jitter.
+        The final response is returned as-is once the retry budget is spent.
+        With ``stream`` the body is left unread and the caller records the
+        transfer once it has consumed it.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                logger.warning(f"  {type(e).__name__} — retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})")
+                time.sleep(delay)
+                continue
+
+            retry_after = self.rate_limiter.observe(response.headers)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                if not stream:
+                    # The body is already read; raw.tell() counts the (compressed) bytes
+                    # that came off the socket, and is 0 for responses served from cache.
+                    self._record_transfer(response.raw.tell(), len(response.content))
+                return response
+
+            response.close()
+            delay = self.rate_limiter.backoff(attempt, retry_after)
+            logger.warning(
+                f"  HTTP {response.status_code} — retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})"
+            )
+            if response.status_code == 429:
+                self.rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+        return response
+
     def _fetch_court_opinions(self, court_id: str, config: dict) -> list[Opinion]:
         """Fetch opinions for a single court using the opinion-clusters endpoint."""
-        opinions = []
+        return list(self._iter_court_opinions(court_id, config))
+
+    def _iter_court_opinions(self, court_id: str, config: dict) -> Iterator[Opinion]:
+        """Yield a single court's opinions page by page as results are parsed."""
+        newest = None
         cl_court_id = config["cl_id"]
-        date_after = self.cutoff_date.strftime("%Y-%m-%d")
+        date_after = self._filed_after(court_id).strftime("%Y-%m-%d")
 
         # Use the search endpoint with type=o for opinions
         # This is the best-documented endpoint for court filtering
@@ -92,41 +403,171 @@ class CourtListenerScraper:
             "order_by": "dateFiled desc",
             "format": "json",
         }
-
+        if SEARCH_FIELDS:
+            # Only request the keys _parse_search_result reads
+            params["fields"] = ",".join(SEARCH_FIELDS)
+
+        if self.stream_pages:
+            results = self._iter_results_streaming(url, params)
+        elif self.prefetch_pages > 0:
+            results = (r for page in self._iter_pages_prefetch(url, params, self.prefetch_pages) for r in page)
+        else:
+            results = (r for page in self._iter_pages(url, params) for r in page)
+
+        for result in results:
+            opinion = self._parse_search_result(result, court_id, config)
+            if opinion:
+                if newest is None or _recency(opinion) > _recency(newest):
+                    newest = opinion
+                yield opinion
+
+        # Only reached once every page was consumed
+        if newest:
+            self._advance_high_water(court_id, [newest])
+
+    def _filed_after(self, court_id: str) -> datetime:
+        """
+        Earliest filing date to request for a court.
+
+        Normally the lookback cutoff; once a high-water mark exists, only a
+        small overlap before it is re-requested (to pick up late corrections).
+        """
+        mark = self.high_water.get(court_id)
+        if not mark:
+            return self.cutoff_date
+        try:
+            mark_date = datetime.strptime(mark["date_filed"], "%Y-%m-%d")
+        except (KeyError, ValueError):
+            return self.cutoff_date
+        filed_after = max(self.cutoff_date, mark_date - timedelta(days=HIGH_WATER_OVERLAP_DAYS))
+        logger.info(f"  Incremental fetch since {filed_after.strftime('%Y-%m-%d')} (high-water {mark['date_filed']})")
+        return filed_after
+
+    def _advance_high_water(self, court_id: str, opinions: list[Opinion]):
+        """Move a court's high-water mark forward to the newest opinion fetched."""
+        if not opinions:
+            return
+        latest = max(opinions, key=_recency)
+        date_filed = latest.date.strftime("%Y-%m-%d")
+        if date_filed < self.high_water.get(court_id, {}).get("date_filed", ""):
+            return
+        self.high_water[court_id] = {"date_filed": date_filed, "cluster_id": latest.cluster_id}
+
+    def _iter_pages(self, url: str, params: dict | None) -> Iterator[list[dict]]:
+        """Yield the ``results`` list of each search page, following ``next`` links."""
         page_count = 0
         while url and page_count < 10:  # Safety limit: max 10 pages
             try:
-                response = self.session.get(url, params=params if page_count == 0 else None, timeout=30)
+                response = self._get(url, params=params if page_count == 0 else None, timeout=30)
                 response.raise_for_status()
                 data = response.json()
-
-                results = data.get("results", [])
-                if not results:
-                    break
-
-                for result in results:
-                    opinion = self._parse_search_result(result, court_id, config)
-                    if opinion:
-                        opinions.append(opinion)
-
-                # Follow pagination
-                url = data.get("next")
-                params = None  # Next URL already has params
-                page_count += 1
-                if url:
-                    time.sleep(0.3)
-
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    logger.warning("  Rate limited — waiting 30 seconds...")
-                    time.sleep(30)
-                    continue
-                elif e.response.status_code == 400:
+                if e.response.status_code == 400:
                     logger.error(f"  400 Bad Request. Response: {e.response.text[:500]}")
-                    break
+                    return
                 raise
 
-        return opinions
+            results = data.get("results", [])
+            if not results:
+                return
+
+            # Follow pagination
+            url = data.get("next")
+            params = None  # Next URL already has params
+            page_count += 1
+            yield results
+
+    def _iter_pages_prefetch(self, url: str, params: dict | None, lookahead: int) -> Iterator[list[dict]]:
+        """
+        Like ``_iter_pages``, but downloads ahead on a background thread.
+
+        Up to ``lookahead`` pages are buffered, so page N+1 is already in
+        flight while the caller parses page N. Errors from the fetch thread
+        are re-raised here, in page order.
+        """
+        pages = queue.Queue(maxsize=lookahead)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for results in self._iter_pages(url, params):
+                    if not put(results):
+                        return
+                put(_END_OF_STREAM)
+            except Exception as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name="page-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _iter_results_streaming(self, url: str, params: dict | None) -> Iterator[dict]:
+        """
+        Yield search results one at a time while each page is still downloading.
+
+        The body is parsed incrementally with ijson, so peak memory is one
+        result rather than one page, however large the page. Pages are
+        fetched one after another (no prefetch).
+        """
+        page_count = 0
+        while url and page_count < 10:  # Safety limit: max 10 pages
+            response = self._get(url, params=params if page_count == 0 else None, timeout=30, stream=True)
+            try:
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 400:
+                        logger.error(f"  400 Bad Request. Response: {e.response.text[:500]}")
+                        return
+                    raise
+
+                response.raw.decode_content = True
+                body = _CountingReader(response.raw)
+                next_url = None
+                result_count = 0
+                builder = None
+                for prefix, event, value in ijson.parse(body, use_float=True):
+                    if prefix == "next" and event in ("string", "null"):
+                        next_url = value
+                    elif prefix == "results.item" and event == "start_map":
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    elif builder is not None:
+                        builder.event(event, value)
+                        if prefix == "results.item" and event == "end_map":
+                            result_count += 1
+                            yield builder.value
+                            builder = None
+                wire_bytes = 0 if getattr(response, "from_cache", False) else response.raw.tell()
+                self._record_transfer(wire_bytes, body.bytes_read)
+            finally:
+                response.close()
+
+            if not result_count:
+                return
+
+            # Follow pagination
+            url = next_url
+            params = None  # Next URL already has params
+            page_count += 1
 
     @staticmethod
     def _resolve_court(docket_number: str, default_court_id: str, default_config: dict) -> tuple[str, str]:
@@ -217,9 +658,11 @@ class CourtListenerScraper:
                 pdf_url=pdf_url,
                 page_url=page_url,
                 text_content=text_content[:15000] if text_content else "",
+                text_source="snippet" if text_content else "",
                 docket_number=docket_number,
                 citation=citation_str,
                 judges=judges,
+                cluster_id=str(cluster_id),
             )
         except Exception as e:
             logger.debug(f"Error parsing search result: {e}")
@@ -231,40 +674,229 @@ class CourtListenerScraper:
             if not opinion_url.startswith("http"):
                 opinion_url = f"https://www.courtlistener.com{opinion_url}"
 
-            response = self.session.get(opinion_url, timeout=15)
+            response = self._get(opinion_url, timeout=15)
             response.raise_for_status()
             data = response.json()
 
-            text = (
-                data.get("plain_text", "")
-                or data.get("html", "")
-                or data.get("html_lawbox", "")
-                or data.get("html_columbia", "")
-                or data.get("html_anon_2020", "")
-                or ""
-            )
-
-            pdf_url = data.get("download_url", "") or ""
-            if pdf_url and not pdf_url.startswith("http"):
-                pdf_url = f"https://www.courtlistener.com{pdf_url}"
+            text = extract_opinion_text(data)
+            pdf_url = courtlistener_url(data.get("download_url", "") or "")
 
             return text, pdf_url
         except Exception as e:
             logger.debug(f"Error fetching opinion text: {e}")
             return "", ""
 
-    def extract_pdf_text(self, opinion: Opinion, max_pages: int = 30) -> str:
-        """Return existing text content (already fetched from API)."""
-        return opinion.text_content
+    def hydrate_texts(
+        self, opinions: Iterable[Opinion], batch_size: int = HYDRATE_BATCH_SIZE
+    ) -> Iterator[Opinion]:
+        """
+        Fill in ``text_content`` with full opinion text, ``batch_size`` opinions at a time.
+
+        Each batch costs one id-filtered request to the opinions endpoint
+        (``cluster__id__in``) instead of one request per case; clusters the
+        batch lookup misses are fetched individually on a small thread pool.
+        Opinions are yielded back, in order, once their batch is hydrated.
+        Opinions without a cluster id keep their search snippet.
+        """
+        batch = []
+        for opinion in opinions:
+            batch.append(opinion)
+            if len(batch) >= batch_size:
+                yield from self._hydrate_batch(batch)
+                batch = []
+        if batch:
+            yield from self._hydrate_batch(batch)
+
+    def _hydrate_batch(self, batch: list[Opinion]) -> list[Opinion]:
+        # Texts already on local disk need no request at all
+        for opinion in batch:
+            stored = self.text_store.get(opinion.cluster_id) if opinion.cluster_id else None
+            if stored:
+                opinion.text_content, opinion.text_source = stored
+
+        cluster_ids = list(dict.fromkeys(
+            o.cluster_id for o in batch if o.cluster_id and o.text_source not in ("api", "pdf")
+        ))
+        if not cluster_ids:
+            return batch
+
+        texts = self._fetch_cluster_texts({"cluster__id__in": ",".join(cluster_ids)})
+        missing = [cid for cid in cluster_ids if cid not in texts]
+        if missing:
+            with ThreadPoolExecutor(max_workers=HYDRATE_MAX_WORKERS, thread_name_prefix="hydrate") as pool:
+                for found in pool.map(lambda cid: self._fetch_cluster_texts({"cluster": cid}), missing):
+                    texts.update(found)
+
+        for cluster_id, (text, _) in texts.items():
+            self.text_store.put(cluster_id, text, "api")
+        self.text_store.flush()
+        if self.http_cache:
+            self.http_cache.flush()
+
+        hydrated = 0
+        for opinion in batch:
+            text, pdf_url = texts.get(opinion.cluster_id, ("", ""))
+            if text:
+                opinion.text_content = text
+                opinion.text_source = "api"
+                hydrated += 1
+            if pdf_url and not opinion.pdf_url:
+                opinion.pdf_url = pdf_url
+        logger.info(f"Hydrated full text for {hydrated}/{len(cluster_ids)} opinions from CourtListener")
+        return batch
+
+    def _fetch_cluster_texts(self, filters: dict) -> dict[str, tuple[str, str]]:
+        """
+        Fetch opinion texts from the opinions endpoint, grouped by cluster id.
+
+        A cluster can hold several opinions (lead, concurrence, dissent);
+        their texts are joined in the order the API returns them.
+        """
+        texts = {}
+        url = f"{COURTLISTENER_API_BASE}/opinions/"
+        params = {
+            **filters,
+            "fields": "cluster_id,cluster,plain_text,html_with_citations,html,html_lawbox,"
+                      "html_columbia,html_anon_2020,download_url",
+            "format": "json",
+        }
+        try:
+            for results in self._iter_pages(url, params):
+                for data in results:
+                    cluster_id = str(data.get("cluster_id", "") or "")
+                    if not cluster_id and data.get("cluster"):
+                        cluster_id = str(data["cluster"]).rstrip("/").rsplit("/", 1)[-1]
+                    text = extract_opinion_text(data)
+                    if not cluster_id or not text:
+                        continue
+                    previous_text, pdf_url = texts.get(cluster_id, ("", ""))
+                    texts[cluster_id] = (
+                        f"{previous_text}\n\n{text}" if previous_text else text,
+                        pdf_url or courtlistener_url(data.get("download_url", "") or ""),
+                    )
+        except Exception as e:
+            logger.debug(f"Error fetching opinion texts for {filters}: {e}")
+        return texts
+
+    def extract_pdf_text(self, opinion: Opinion, max_pages: int = PDF_MAX_PAGES) -> str:
+        """Download an opinion's PDF and extract its text in-process (cached by content hash)."""
+        if not opinion.pdf_url:
+            return opinion.text_content
+        try:
+            return self._extract_pdf(opinion.pdf_url, max_pages, extract_pdf_file)
+        except Exception as e:
+            logger.warning(f"PDF extraction failed for {opinion.case_number}: {e}")
+            return opinion.text_content
+
+    def extract_pdf_texts(
+        self, opinions: Iterable[Opinion], max_pages: int = PDF_MAX_PAGES
+    ) -> Iterator[Opinion]:
+        """
+        Fill in ``text_content`` from PDFs for opinions the API had no text for.
+
+        PDFs are downloaded on a thread pool and parsed in a process pool, so
+        CPU-bound parsing uses every core without stalling downloads. Text is
+        cached by PDF content hash. Opinions are yielded back in input order
+        as soon as they (and everything before them) are done.
+        """
+        pending = deque()
+        # Court and hydration threads are still running here, and a forked child
+        # can inherit a lock one of them holds (e.g. logging's), so don't fork
+        with (
+            ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_PROCESSES, mp_context=multiprocessing.get_context("forkserver")
+            ) as processes,
+            ThreadPoolExecutor(max_workers=HYDRATE_MAX_WORKERS, thread_name_prefix="pdf") as downloads,
+        ):
+
+            def parse_in_pool(path: str, pages: int) -> str:
+                return processes.submit(extract_pdf_file, path, pages).result()
+
+            for opinion in opinions:
+                future = None
+                if opinion.pdf_url and opinion.text_source not in ("api", "pdf"):
+                    future = downloads.submit(self._extract_pdf, opinion.pdf_url, max_pages, parse_in_pool)
+                pending.append((opinion, future))
+                while pending and (pending[0][1] is None or pending[0][1].done()):
+                    yield self._finish_pdf(*pending.popleft())
+
+            while pending:
+                yield self._finish_pdf(*pending.popleft())
+
+        self.text_store.flush()
+        self.pdf_cache.prune()
+        if self.http_cache:
+            self.http_cache.flush()
+
+    def _finish_pdf(self, opinion: Opinion, future) -> Opinion:
+        if future is None:
+            return opinion
+        try:
+            text = future.result()
+        except Exception as e:
+            logger.warning(f"PDF extraction failed for {opinion.case_number}: {e}")
+            return opinion
+        if text:
+            opinion.text_content = text
+            opinion.text_source = "pdf"
+            if opinion.cluster_id:
+                self.text_store.put(opinion.cluster_id, text, "pdf")
+        return opinion
+
+    def _extract_pdf(self, pdf_url: str, max_pages: int, parse) -> str:
+        """Stream a PDF to a temp file while hashing it, then parse it unless cached."""
+        response = self._get(pdf_url, timeout=60, stream=True)
+        try:
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                path = f.name
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    digest.update(chunk)
+                    f.write(chunk)
+        finally:
+            response.close()
+
+        try:
+            cached = self.pdf_cache.get(digest.hexdigest(), max_pages)
+            if cached is not None:
+                return cached
+            text = parse(path, max_pages)
+            self.pdf_cache.put(digest.hexdigest(), max_pages, text)
+            return text
+        finally:
+            os.remove(path)
 
 
 # Keep the same function signatures for compatibility with main.py
-def scrape_opinions() -> list[Opinion]:
-    """Main entry point: fetch all courts and return opinions."""
-    scraper = CourtListenerScraper()
+def scrape_opinions(
+    use_async: bool = False, use_cache: bool = True, high_water: dict | None = None
+) -> list[Opinion]:
+    """
+    Main entry point: fetch all courts and return opinions.
+
+    With ``use_async`` the fetch is driven by ``AsyncCourtListenerScraper``
+    on an event loop instead of the requests-based thread pool. The on-disk
+    HTTP cache applies to the requests-based scraper only. ``high_water``
+    (per-court marks from a previous run) limits the fetch to newer opinions
+    and is updated in place.
+    """
+    if use_async:
+        import asyncio
+        from async_scraper import scrape_opinions_async
+
+        return asyncio.run(scrape_opinions_async(high_water=high_water))
+
+    scraper = CourtListenerScraper(cache_dir=HTTP_CACHE_DIR if use_cache else None, high_water=high_water)
     return scraper.scrape_all_courts()
 
 
+def iter_opinions(use_cache: bool = True, high_water: dict | None = None) -> Iterator[Opinion]:
+    """Streaming entry point: yield opinions from all courts as pages arrive."""
+    scraper = CourtListenerScraper(cache_dir=HTTP_CACHE_DIR if use_cache else None, high_water=high_water)
+    yield from scraper.iter_opinions()
+
+
 # Alias for backward compatibility
 FloridaCourtScraper = CourtListenerScraper
 
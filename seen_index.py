@@ -0,0 +1,204 @@
+"""
+On-disk index of every opinion ID ever processed, for long backfills.
+
+Two files sit side by side:
+
+- ``<path>.bloom`` — a Bloom filter, memory-mapped. A miss means the ID is
+  definitely new, which costs one probe of a few bits and no RAM.
+- ``<path>.ids`` — the authoritative, sorted, newline-separated ID list,
+  memory-mapped and binary-searched only when the filter says "maybe".
+
+Nothing is loaded into Python objects, so memory stays flat however many
+years of IDs the index holds. New IDs are merged in once per run.
+"""
+
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator
+
+from config import SEEN_INDEX_FALSE_POSITIVE_RATE
+
+logger = logging.getLogger(__name__)
+
+_BLOOM_MAGIC = b"FLBLOOM1"
+_BLOOM_HEADER = struct.Struct("<8sQQQQ")  # magic, bits, hashes, capacity, count
+_MIN_CAPACITY = 10_000
+
+
+class BloomFilter:
+    """Memory-mapped Bloom filter over a file created by ``BloomFilter.create``."""
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self._file = open(path, "r+b" if writable else "rb")
+        self._mmap = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        )
+        magic, self.num_bits, self.num_hashes, self.capacity, self.count = _BLOOM_HEADER.unpack_from(self._mmap)
+        if magic != _BLOOM_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+
+    @staticmethod
+    def create(path: str, capacity: int, false_positive_rate: float = SEEN_INDEX_FALSE_POSITIVE_RATE):
+        """Write an empty filter sized for ``capacity`` items."""
+        num_bits = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        with open(path, "wb") as f:
+            f.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, num_bits, num_hashes, capacity, 0))
+            f.truncate(_BLOOM_HEADER.size + (num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, item: str) -> bool:
+        mm = self._mmap
+        return all(mm[_BLOOM_HEADER.size + pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+    def add(self, item: str):
+        mm = self._mmap
+        for pos in self._positions(item):
+            mm[_BLOOM_HEADER.size + pos // 8] |= 1 << (pos % 8)
+        self.count += 1
+
+    def flush(self):
+        _BLOOM_HEADER.pack_into(
+            self._mmap, 0, _BLOOM_MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count
+        )
+        self._mmap.flush()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+def _sorted_file_contains(mm, key: bytes) -> bool:
+    """Binary search a memory-mapped file of sorted, newline-separated keys."""
+    lo, hi = 0, len(mm)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = mm.rfind(b"\n", 0, mid) + 1
+        end = mm.find(b"\n", start)
+        if end == -1:
+            end = len(mm)
+        line = mm[start:end]
+        if line == key:
+            return True
+        if line < key:
+            lo = end + 1
+        else:
+            hi = start
+    return False
+
+
+class SeenIndex:
+    """Bloom filter in front of a sorted ID file; ``uid in index`` checks both in that order."""
+
+    def __init__(self, path: str):
+        self.bloom_path = f"{path}.bloom"
+        self.ids_path = f"{path}.ids"
+        self.probes = 0  # lookups that needed the sorted file
+        self._bloom = None
+        self._ids_file = None
+        self._ids_mmap = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.ids_path):
+            open(self.ids_path, "wb").close()
+        if not os.path.exists(self.bloom_path):
+            self._rebuild_bloom()
+        self._open()
+
+    def _open(self):
+        try:
+            self._bloom = BloomFilter(self.bloom_path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Rebuilding unreadable Bloom filter {self.bloom_path}: {e}")
+            self._rebuild_bloom()
+            self._bloom = BloomFilter(self.bloom_path)
+        self._ids_file = open(self.ids_path, "rb")
+        if os.path.getsize(self.ids_path):
+            self._ids_mmap = mmap.mmap(self._ids_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_maps(self):
+        if self._bloom is not None:
+            self._bloom.close()
+            self._bloom = None
+        if self._ids_mmap is not None:
+            self._ids_mmap.close()
+            self._ids_mmap = None
+        if self._ids_file is not None:
+            self._ids_file.close()
+            self._ids_file = None
+
+    def __len__(self) -> int:
+        return self._bloom.count
+
+    def __contains__(self, unique_id: str) -> bool:
+        if unique_id not in self._bloom:
+            return False
+        self.probes += 1
+        return self._ids_mmap is not None and _sorted_file_contains(self._ids_mmap, unique_id.encode("utf-8"))
+
+    def _iter_ids(self) -> Iterator[bytes]:
+        with open(self.ids_path, "rb") as f:
+            for line in f:
+                yield line.rstrip(b"\n")
+
+    def add(self, unique_ids: Iterable[str]) -> int:
+        """Merge new IDs into the sorted file and the filter; returns how many were new."""
+        new_ids = sorted({uid.encode("utf-8") for uid in unique_ids if uid not in self})
+        if not new_ids:
+            return 0
+        self._close_maps()
+
+        tmp_path = f"{self.ids_path}.tmp"
+        count = 0
+        with open(tmp_path, "wb") as f:
+            previous = None
+            for uid in heapq.merge(self._iter_ids(), new_ids):
+                if uid != previous:
+                    f.write(uid + b"\n")
+                    count += 1
+                    previous = uid
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.ids_path)
+
+        bloom = BloomFilter(self.bloom_path, writable=True)
+        if count > bloom.capacity:
+            bloom.close()
+            self._rebuild_bloom()
+        else:
+            for uid in new_ids:
+                bloom.add(uid.decode("utf-8"))
+            bloom.flush()
+            bloom.close()
+        self._open()
+        return len(new_ids)
+
+    def _rebuild_bloom(self):
+        """Recreate the filter from the sorted file, sized with room to grow."""
+        count = sum(1 for _ in self._iter_ids())
+        tmp_path = f"{self.bloom_path}.tmp"
+        BloomFilter.create(tmp_path, max(_MIN_CAPACITY, 2 * count))
+        bloom = BloomFilter(tmp_path, writable=True)
+        for uid in self._iter_ids():
+            bloom.add(uid.decode("utf-8"))
+        bloom.flush()
+        bloom.close()
+        os.replace(tmp_path, self.bloom_path)
+        logger.info(f"Built Bloom filter {self.bloom_path} over {count} IDs")
+
+    def close(self):
+        self._close_maps()
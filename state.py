@@ -0,0 +1,566 @@
+"""
+Persistent pipeline state: which opinions have been seen, their summaries,
+per-court high-water marks, and the opinions still inside the feed's
+lookback window.
+
+Two interchangeable backends:
+
+- ``JSONStateStore`` — the original ``state.json`` file, now a snapshot plus
+  an append-only ``state.json.journal`` of what each run added. Saves append
+  (and fsync) one journal line; every ``STATE_SNAPSHOT_EVERY`` saves the
+  snapshot is rewritten atomically and the journal is cleared.
+- ``SQLiteStateStore`` — an indexed ``opinions`` table (WAL mode), so lookups
+  are O(log n) and each run only inserts what is new. ``state.json`` can be
+  imported into it for migration.
+
+``open_state_store`` picks the backend from the file extension. Both migrate
+state written with older ``<court>:<docket>`` IDs to the canonical
+``Opinion.unique_id`` scheme the first time they open it.
+
+Each opinion also carries its pipeline status (``PIPELINE_STAGES``: fetched →
+text_hydrated → summarized → published), so a run that fails or is killed
+part-way resumes the unfinished opinions instead of dropping them.
+
+Both backends forget opinions filed more than the lookback window plus
+``STATE_RETENTION_MARGIN_DAYS`` ago (the scraper never requests those
+again), so state size tracks the window rather than all of history.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from config import LOOKBACK_DAYS, PIPELINE_CHECKPOINT_EVERY, STATE_RETENTION_MARGIN_DAYS, STATE_SNAPSHOT_EVERY
+from scraper import Opinion, canonical_opinion_id
+from text_store import text_hash
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Pipeline stages an opinion moves through, in order
+FETCHED = "fetched"
+TEXT_HYDRATED = "text_hydrated"
+SUMMARIZED = "summarized"
+PUBLISHED = "published"
+PIPELINE_STAGES = (FETCHED, TEXT_HYDRATED, SUMMARIZED, PUBLISHED)
+
+# Version of the opinion ID scheme stored state uses (2 = canonical docket IDs)
+ID_SCHEME = 2
+
+
+class StateFileError(Exception):
+    """A state file exists but can't be read; starting from empty state would re-process everything."""
+
+
+def load_state(state_file: str) -> dict:
+    """Load the raw state file (seen IDs, high-water marks, recent opinions)."""
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise StateFileError(f"Can't read state file {state_file}: {e}") from e
+
+
+def load_seen_opinions(state_file: str) -> set[str]:
+    """Load previously seen opinion IDs to avoid re-processing."""
+    return set(load_state(state_file).get("seen_ids", []))
+
+
+def save_seen_opinions(
+    state_file: str,
+    seen_ids: dict[str, str],
+    high_water: dict | None = None,
+    recent: list[dict] | None = None,
+    summaries: dict[str, str] | None = None,
+    status: dict[str, str] | None = None,
+):
+    """
+    Save seen opinion IDs for deduplication, plus incremental-fetch state and summaries.
+
+    ``seen_ids`` maps each ID to its filing date (used for retention); ``status``
+    maps IDs to their pipeline stage (IDs without one count as published).
+    """
+    # Write a sibling file and rename it over the old one, so a crash leaves either
+    # the old state or the new state on disk, never a truncated file
+    tmp_path = f"{state_file}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "seen_ids": seen_ids,
+            "high_water": high_water or {},
+            "recent": recent or [],
+            "summaries": summaries or {},
+            "status": status or {},
+            "id_scheme": ID_SCHEME,
+            "last_updated": datetime.now().isoformat(),
+        }, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, state_file)
+
+
+def _opinions_from_dicts(records: Iterable[dict], cutoff: datetime) -> list[Opinion]:
+    opinions = []
+    for data in records:
+        try:
+            opinion = Opinion.from_dict(data)
+        except Exception:
+            continue
+        if opinion.date >= cutoff:
+            opinions.append(opinion)
+    return opinions
+
+
+class JSONStateStore:
+    """State kept in a JSON snapshot plus an append-only journal of later saves."""
+
+    def __init__(self, path: str, lookback_days: int = LOOKBACK_DAYS):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.lookback_days = lookback_days
+        self._pending = _empty_journal_entry()
+        self._journal_entries = 0
+        state = load_state(path)
+        seen_ids = state.get("seen_ids", [])
+        if isinstance(seen_ids, dict):
+            self._seen_ids = dict(seen_ids)
+        else:
+            # Older state files kept a bare list; date those IDs by the last save
+            fallback_date = (state.get("last_updated") or datetime.now().isoformat())[:10]
+            self._seen_ids = {uid: fallback_date for uid in seen_ids}
+        self._status = state.get("status", {})
+        self._recent = {
+            o.unique_id: _state_dict(o, self._status.get(o.unique_id, PUBLISHED))
+            for o in _opinions_from_dicts(state.get("recent", []), datetime.min)
+        }
+        self.high_water = state.get("high_water", {})
+        self._summaries = state.get("summaries", {})
+        self._needs_snapshot = bool(state) and state.get("id_scheme", 1) < ID_SCHEME
+        if self._needs_snapshot:
+            self._migrate_ids()
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply journal entries written since the snapshot (each is an idempotent upsert)."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path) as f:
+            lines = f.readlines()
+        for number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                if number == len(lines):
+                    # A crash mid-append leaves a torn last line; that batch was never acknowledged
+                    logger.warning(f"Ignoring incomplete last entry in {self.journal_path}")
+                    self._needs_snapshot = True
+                    break
+                raise StateFileError(f"Corrupt entry on line {number} of {self.journal_path}: {e}") from e
+            self._seen_ids.update(entry["seen_ids"])
+            self._summaries.update(entry["summaries"])
+            self._status.update(entry.get("status", {}))
+            recent = entry["recent"]
+            if isinstance(recent, list):
+                # Journals written before entries were keyed by ID
+                recent = {data["unique_id"]: data["opinion"] for data in recent}
+            self._recent.update(recent)
+            self.high_water = entry["high_water"]
+            self._journal_entries += 1
+        if self._journal_entries:
+            logger.info(f"Replayed {self._journal_entries} journal entries from {self.journal_path}")
+
+    def _migrate_ids(self):
+        """Rewrite seen IDs and summaries to canonical IDs, merging duplicates."""
+        before = len(self._seen_ids)
+        seen_ids = {}
+        for uid, date in self._seen_ids.items():
+            canonical = canonical_opinion_id(uid)
+            seen_ids[canonical] = max(date, seen_ids.get(canonical, date))
+        summaries = {}
+        for uid, summary in self._summaries.items():
+            if summary:
+                summaries.setdefault(canonical_opinion_id(uid), summary)
+        self._seen_ids = seen_ids
+        self._summaries = summaries
+        logger.info(f"Migrated {before} seen IDs in {self.path} to {len(seen_ids)} canonical IDs")
+
+    def is_seen(self, unique_id: str) -> bool:
+        return unique_id in self._seen_ids
+
+    def seen_ids(self) -> Iterator[str]:
+        return iter(list(self._seen_ids))
+
+    def seen_dates(self) -> dict[str, str]:
+        """Filing date (YYYY-MM-DD) of every seen ID."""
+        return dict(self._seen_ids)
+
+    def record(self, opinions: Iterable[Opinion], status: str | None = None):
+        """
+        Mark opinions as seen, keep their summaries, and remember them for rebuilding the feed.
+
+        New opinions start at ``FETCHED``; ``status`` advances them (never backwards).
+        """
+        for opinion in opinions:
+            uid = opinion.unique_id
+            current = self._status.get(uid, PUBLISHED) if uid in self._seen_ids else None
+            new_status = current or FETCHED
+            if status and _stage(status) > _stage(new_status):
+                new_status = status
+            if new_status != current:
+                self._status[uid] = self._pending["status"][uid] = new_status
+            # Only what actually changed goes into the journal
+            date = opinion.date.strftime("%Y-%m-%d")
+            if self._seen_ids.get(uid) != date:
+                self._seen_ids[uid] = self._pending["seen_ids"][uid] = date
+            data = _state_dict(opinion, new_status)
+            if self._recent.get(uid) != data:
+                self._recent[uid] = self._pending["recent"][uid] = data
+            if opinion.summary and self._summaries.get(uid) != opinion.summary:
+                self._summaries[uid] = self._pending["summaries"][uid] = opinion.summary
+
+    def summaries(self, unique_ids: Iterable[str]) -> dict[str, str]:
+        """Stored summaries for the given IDs (IDs without one are omitted)."""
+        return {uid: self._summaries[uid] for uid in unique_ids if uid in self._summaries}
+
+    def recent_opinions(self, cutoff: datetime) -> list[Opinion]:
+        """Opinions recorded by earlier runs that were filed on or after ``cutoff``."""
+        return _opinions_from_dicts(self._recent.values(), cutoff)
+
+    def unfinished(self, cutoff: datetime) -> list[tuple[Opinion, str]]:
+        """``(opinion, status)`` for opinions filed since ``cutoff`` that haven't been published."""
+        pending = [
+            self._recent[uid] for uid, status in self._status.items()
+            if status != PUBLISHED and uid in self._recent
+        ]
+        return [(o, self._status[o.unique_id]) for o in _opinions_from_dicts(pending, cutoff)]
+
+    def prune(self) -> int:
+        """Apply the retention policy; returns how many seen IDs were dropped."""
+        retain_after = _retention_cutoff(self.lookback_days)
+        expired = [uid for uid, date in self._seen_ids.items() if date < retain_after]
+        for uid in expired:
+            del self._seen_ids[uid]
+            self._summaries.pop(uid, None)
+            self._status.pop(uid, None)
+        return len(expired)
+
+    def compact(self) -> int:
+        """Drop expired state, rewrite the snapshot, and clear the journal."""
+        removed = self.prune()
+        self.snapshot()
+        return removed
+
+    def save(self):
+        """Append this run's changes to the journal, or snapshot when the journal is long."""
+        self.prune()
+        if self._needs_snapshot or self._journal_entries >= STATE_SNAPSHOT_EVERY or not os.path.exists(self.path):
+            self.snapshot()
+            return
+        self._pending["high_water"] = self.high_water
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(self._pending) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += 1
+        self._pending = _empty_journal_entry()
+
+    def snapshot(self):
+        """Atomically rewrite the full state file, then drop the journal it supersedes."""
+        cutoff = datetime.now() - timedelta(days=self.lookback_days)
+        recent = [
+            data for data in self._recent.values()
+            if data.get("date", "") >= cutoff.strftime("%Y-%m-%d")
+        ]
+        # Anything without a status counts as published, so only unfinished ones are written
+        unfinished = {uid: status for uid, status in self._status.items() if status != PUBLISHED}
+        save_seen_opinions(self.path, self._seen_ids, self.high_water, recent, self._summaries, unfinished)
+        # If we crash before this, the next load replays the journal onto the new snapshot,
+        # which is harmless because entries are upserts
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_entries = 0
+        self._needs_snapshot = False
+        self._pending = _empty_journal_entry()
+
+    def close(self):
+        pass
+
+
+class SQLiteStateStore:
+    """State kept in SQLite: one indexed row per opinion, updated incrementally."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS opinions (
+            unique_id TEXT PRIMARY KEY,
+            first_seen TEXT NOT NULL,
+            court TEXT,
+            date TEXT,
+            summary TEXT NOT NULL DEFAULT '',
+            text_hash TEXT NOT NULL DEFAULT '',
+            data TEXT,  -- serialized Opinion (without text), for rebuilding the feed
+            status TEXT NOT NULL DEFAULT 'published'  -- pipeline stage; rows from before stages were tracked count as published
+        );
+        CREATE INDEX IF NOT EXISTS opinions_date ON opinions (date);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, lookback_days: int = LOOKBACK_DAYS):
+        self.path = path
+        self.lookback_days = lookback_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(opinions)")}
+        if "status" not in columns:
+            self.conn.execute("ALTER TABLE opinions ADD COLUMN status TEXT NOT NULL DEFAULT 'published'")
+        self.high_water = self._get_meta("high_water", {})
+        if self._get_meta("id_scheme", 1) < ID_SCHEME:
+            self._migrate_ids()
+
+    def _get_meta(self, key: str, default):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    def _migrate_ids(self):
+        """Rewrite every row to its canonical ID, merging rows that collapse together."""
+        rows = self.conn.execute(
+            "SELECT unique_id, first_seen, court, date, summary, text_hash, data, status FROM opinions"
+        ).fetchall()
+        merged = {}
+        for uid, first_seen, court, date, summary, digest, data, status in rows:
+            canonical = canonical_opinion_id(uid)
+            if canonical not in merged:
+                merged[canonical] = [canonical, first_seen, court, date, summary, digest, data, status]
+                continue
+            row = merged[canonical]
+            row[1] = min(row[1], first_seen)
+            row[3] = max(filter(None, (row[3], date)), default=None)
+            row[2], row[4], row[5], row[6] = row[2] or court, row[4] or summary, row[5] or digest, row[6] or data
+            row[7] = max(row[7], status, key=_stage)
+        with self.conn:
+            self.conn.execute("DELETE FROM opinions")
+            self.conn.executemany(
+                "INSERT INTO opinions (unique_id, first_seen, court, date, summary, text_hash, data, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                merged.values(),
+            )
+            self._set_meta("id_scheme", ID_SCHEME)
+        if rows:
+            logger.info(f"Migrated {len(rows)} opinions in {self.path} to {len(merged)} canonical IDs")
+
+    def is_seen(self, unique_id: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM opinions WHERE unique_id = ?", (unique_id,)).fetchone()
+        return row is not None
+
+    def seen_ids(self) -> Iterator[str]:
+        return (uid for (uid,) in self.conn.execute("SELECT unique_id FROM opinions"))
+
+    def record(self, opinions: Iterable[Opinion], status: str | None = None):
+        """
+        Insert new opinions and refresh the stored metadata of known ones.
+
+        New opinions start at ``FETCHED``; ``status`` advances them (never backwards).
+        """
+        opinions = list(opinions)
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                o.unique_id,
+                now,
+                o.court_id,
+                o.date.strftime("%Y-%m-%d"),
+                o.summary,
+                text_hash(o.text_content) if o.text_content else "",
+                json.dumps(_state_dict(o, status or FETCHED)),
+                FETCHED,
+            )
+            for o in opinions
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO opinions (unique_id, first_seen, court, date, summary, text_hash, data, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (unique_id) DO UPDATE SET
+                    court = excluded.court,
+                    date = excluded.date,
+                    data = excluded.data,
+                    summary = CASE WHEN excluded.summary != '' THEN excluded.summary ELSE opinions.summary END,
+                    text_hash = CASE WHEN excluded.text_hash != '' THEN excluded.text_hash ELSE opinions.text_hash END
+                """,
+                rows,
+            )
+            if status:
+                earlier = PIPELINE_STAGES[:_stage(status)]
+                self.conn.executemany(
+                    f"UPDATE opinions SET status = ? WHERE unique_id = ? "
+                    f"AND status IN ({','.join('?' * len(earlier))})",
+                    [(status, o.unique_id, *earlier) for o in opinions],
+                )
+
+    def summaries(self, unique_ids: Iterable[str]) -> dict[str, str]:
+        """Stored summaries for the given IDs (IDs without one are omitted)."""
+        summaries = {}
+        unique_ids = list(unique_ids)
+        for start in range(0, len(unique_ids), 500):  # stay under SQLite's parameter limit
+            chunk = unique_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT unique_id, summary FROM opinions WHERE summary != '' "
+                f"AND unique_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            summaries.update(rows)
+        return summaries
+
+    def recent_opinions(self, cutoff: datetime) -> list[Opinion]:
+        """Opinions recorded by earlier runs that were filed on or after ``cutoff``."""
+        rows = self.conn.execute(
+            "SELECT data, summary FROM opinions WHERE date >= ? AND data IS NOT NULL",
+            (cutoff.strftime("%Y-%m-%d"),),
+        )
+        return _opinions_from_dicts(
+            ({**json.loads(data), "summary": summary} for data, summary in rows), cutoff
+        )
+
+    def unfinished(self, cutoff: datetime) -> list[tuple[Opinion, str]]:
+        """``(opinion, status)`` for opinions filed since ``cutoff`` that haven't been published."""
+        rows = self.conn.execute(
+            "SELECT data, summary, status FROM opinions "
+            "WHERE status != ? AND date >= ? AND data IS NOT NULL",
+            (PUBLISHED, cutoff.strftime("%Y-%m-%d")),
+        )
+        unfinished = []
+        for data, summary, status in rows:
+            for opinion in _opinions_from_dicts([{**json.loads(data), "summary": summary}], cutoff):
+                unfinished.append((opinion, status))
+        return unfinished
+
+    def prune(self) -> int:
+        """Apply the retention policy; returns how many opinions were dropped."""
+        with self.conn:
+            cursor = self.conn.execute(
+                # Rows imported from state.json have no filing date; age those by first_seen
+                "DELETE FROM opinions WHERE COALESCE(date, substr(first_seen, 1, 10)) < ?",
+                (_retention_cutoff(self.lookback_days),),
+            )
+        return cursor.rowcount
+
+    def compact(self) -> int:
+        """Drop expired rows, then reclaim the space they used."""
+        removed = self.prune()
+        self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def save(self):
+        self.prune()
+        with self.conn:
+            self._set_meta("high_water", self.high_water)
+            self._set_meta("last_updated", datetime.now().isoformat())
+
+    def close(self):
+        self.conn.close()
+
+    def import_json(self, state_file: str) -> int:
+        """Import seen IDs, summaries, statuses, high-water marks and recent opinions from a ``state.json``."""
+        # Loading through JSONStateStore replays the journal and canonicalizes IDs
+        source = JSONStateStore(state_file, self.lookback_days)
+        first_seen = datetime.now().isoformat()
+        seen_dates = source.seen_dates()
+        summaries = source.summaries(seen_dates)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO opinions (unique_id, first_seen, date) VALUES (?, ?, ?)",
+                [(uid, first_seen, date) for uid, date in seen_dates.items()],
+            )
+        recent = source.recent_opinions(datetime.min)
+        for opinion in recent:
+            opinion.summary = opinion.summary or summaries.get(opinion.unique_id, "")
+        self.record(recent)
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE opinions SET summary = ? WHERE unique_id = ? AND summary = ''",
+                [(summary, uid) for uid, summary in summaries.items()],
+            )
+            # Rows default to published; carry over opinions still mid-pipeline
+            self.conn.executemany(
+                "UPDATE opinions SET status = ? WHERE unique_id = ?",
+                [(status, o.unique_id) for o, status in source.unfinished(datetime.min)],
+            )
+        if source.high_water:
+            self.high_water.update(source.high_water)
+            self.save()
+        source.close()
+        logger.info(f"Imported {len(seen_dates)} seen IDs from {state_file}")
+        return len(seen_dates)
+
+
+def _empty_journal_entry() -> dict:
+    return {"seen_ids": {}, "summaries": {}, "status": {}, "recent": {}, "high_water": {}}
+
+
+def _stage(status: str) -> int:
+    return PIPELINE_STAGES.index(status)
+
+
+def _state_dict(opinion: Opinion, status: str) -> dict:
+    """Opinion as stored in state: without text, except a search snippet until it is summarized."""
+    # Full text can be hydrated again on resume; a snippet can't
+    keep_snippet = opinion.text_source == "snippet" and _stage(status) < _stage(SUMMARIZED)
+    return opinion.to_dict(include_text=keep_snippet)
+
+
+def track_progress(
+    opinions: Iterable[Opinion],
+    store,
+    status: str,
+    checkpoint_every: int = PIPELINE_CHECKPOINT_EVERY,
+    done=None,
+) -> Iterator[Opinion]:
+    """
+    Pass opinions through, advancing each to ``status`` in ``store``.
+
+    The store is saved every ``checkpoint_every`` opinions (and at the end), so
+    an interrupted run loses at most that many steps. ``done(opinion)`` can
+    veto the advance, e.g. for a summary that failed.
+    """
+    since_checkpoint = 0
+    for opinion in opinions:
+        if done is None or done(opinion):
+            store.record([opinion], status)
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                store.save()
+                since_checkpoint = 0
+        yield opinion
+    if since_checkpoint:
+        store.save()
+
+
+def _retention_cutoff(lookback_days: int) -> str:
+    """Filing date (YYYY-MM-DD) before which seen IDs may be forgotten."""
+    days = lookback_days + STATE_RETENTION_MARGIN_DAYS
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def open_state_store(path: str, lookback_days: int = LOOKBACK_DAYS):
+    """Open the state backend matching ``path``'s extension (SQLite or JSON)."""
+    if path.endswith(SQLITE_SUFFIXES):
+        return SQLiteStateStore(path, lookback_days)
+    return JSONStateStore(path, lookback_days)
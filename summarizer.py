@@ -2,18 +2,62 @@
 Opinion Summarizer using Claude API
 
 Generates concise, plain-language summaries of Florida appellate court opinions.
+Requests run concurrently on a thread pool, bounded by a ``ConcurrencyLimiter``
+that follows the API's rate-limit headers; results keep their input order.
+
+- PCAs, citation-only affirmances, dismissals and errata get a templated
+  summary from ``opinion_classifier`` without calling the model at all.
+- Summaries are memoized by opinion text (``SummaryCache``), so text already
+  summarized under another ID costs nothing.
+- Opinions over ``SUMMARY_TOKEN_BUDGET`` are split at section boundaries,
+  the sections summarized concurrently, and the section summaries combined
+  (map-reduce) instead of truncating the opinion.
+- For bulk runs, ``summarize_batch`` sends everything as one Message Batch
+  (half the per-token price), falling back to the concurrent path for
+  whatever hasn't finished by a deadline.
 """
 
 import logging
 import os
+import re
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
 
-from anthropic import Anthropic
+from anthropic import Anthropic, APIConnectionError, InternalServerError, RateLimitError
 
+from config import (
+    MAX_RETRIES,
+    SUMMARY_BATCH_CANCEL_WAIT,
+    SUMMARY_BATCH_DEADLINE,
+    SUMMARY_BATCH_POLL_INTERVAL,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_MIN_CHARS,
+    SUMMARY_CACHE_PATH,
+    SUMMARY_CACHE_TTL_DAYS,
+    SUMMARY_CHUNK_TOKENS,
+    SUMMARY_MAP_REDUCE,
+    SUMMARY_MAX_CHUNKS,
+    SUMMARY_MAX_CONCURRENCY,
+    SUMMARY_PROMPT_CACHING,
+    SUMMARY_RULE_BASED,
+    SUMMARY_TOKEN_BUDGET,
+)
+from opinion_classifier import classify_opinion, templated_summary
+from rate_limiter import ConcurrencyLimiter, parse_retry_after
 from scraper import Opinion, FloridaCourtScraper
+from summary_cache import SummaryCache, summary_key
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the prompts (or few-shot examples) change, so memoized summaries are not reused
+PROMPT_VERSION = "2"
+
+# Rough size of a token in characters, for budgeting opinion text
+CHARS_PER_TOKEN = 4
+
 SUMMARY_SYSTEM_PROMPT = """You are a legal analyst who summarizes Florida appellate court opinions for a general legal audience.
 
 For each opinion, provide a concise summary (3-5 sentences) that covers:
@@ -35,61 +79,286 @@ Date: {date}
 Opinion Text (excerpt):
 {text}"""
 
+CHUNK_USER_PROMPT = """This is part {part} of {parts} of a Florida appellate court opinion:
+
+Court: {court_name}
+Case Number: {case_number}
+Case Name: {case_name}
+Date: {date}
+
+Summarize this part in 2-4 sentences: the facts, issues, reasoning and any holding or
+disposition it contains. Don't speculate about the parts you haven't seen.
+
+Opinion Text (part {part} of {parts}):
+{text}"""
+
+REDUCE_USER_PROMPT = """Summarize this Florida appellate court opinion from the summaries of its consecutive parts:
+
+Court: {court_name}
+Case Number: {case_number}
+Case Name: {case_name}
+Date: {date}
+
+Part Summaries:
+{text}"""
+
+# Optional few-shot examples sent ahead of every request, as
+# (SUMMARY_USER_PROMPT-formatted opinion, example summary) pairs. They are the
+# same for every call, so with prompt caching they are cached with the system
+# prompt (a prefix only gets cached once it reaches the model's minimum
+# cacheable length, 1024 tokens for Sonnet).
+SUMMARY_FEW_SHOT_EXAMPLES: list[tuple[str, str]] = []
+
 
 class OpinionSummarizer:
     """Summarizes court opinions using the Claude API."""
 
-    def __init__(self, api_key: str | None = None, model: str = "claude-sonnet-4-20250514"):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "claude-sonnet-4-20250514",
+        max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+        base_url: str | None = None,
+        prompt_caching: bool = SUMMARY_PROMPT_CACHING,
+        few_shot_examples: list[tuple[str, str]] | None = None,
+        summary_cache_path: str | None = SUMMARY_CACHE_PATH,
+        rule_based: bool = SUMMARY_RULE_BASED,
+        map_reduce: bool = SUMMARY_MAP_REDUCE,
+    ):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
         if not self.api_key:
             raise ValueError(
                 "ANTHROPIC_API_KEY must be set as an environment variable or passed directly"
             )
-        self.client = Anthropic(api_key=self.api_key)
+        # base_url points the client at a different endpoint, e.g. a local stand-in server in tests
+        # Retries and backoff are left to the shared limiter (see _request_summary)
+        self.client = Anthropic(api_key=self.api_key, base_url=base_url, max_retries=0)
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.limiter = ConcurrencyLimiter(max_concurrency)
+        self.prompt_caching = prompt_caching
+        self.few_shot_examples = SUMMARY_FEW_SHOT_EXAMPLES if few_shot_examples is None else few_shot_examples
+        self.usage = Counter()  # token counts for this summarizer's requests
+        self.summary_cache = (
+            SummaryCache(summary_cache_path, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_DAYS * 86400)
+            if summary_cache_path else None
+        )
+        self.rule_based = rule_based
+        self.map_reduce = map_reduce
+        self._key_locks = {}
+        self._key_locks_lock = threading.Lock()
+        self._usage_lock = threading.Lock()
+
+    @staticmethod
+    def _no_text_summary(opinion: Opinion) -> str:
+        return f"[{opinion.court_name}] {opinion.case_number} — No opinion text available for summarization."
+
+    def _params(self, prompt: str) -> dict:
+        """``messages.create`` arguments for one user prompt (after the shared system prompt and examples)."""
+        return {
+            "model": self.model,
+            "max_tokens": 500,
+            "system": self._system_prompt(),
+            "messages": self._few_shot_messages() + [{"role": "user", "content": prompt}],
+        }
+
+    @staticmethod
+    def _case_fields(opinion: Opinion) -> dict:
+        return {
+            "court_name": opinion.court_name,
+            "case_number": opinion.case_number,
+            "case_name": opinion.case_name,
+            "date": opinion.date.strftime("%B %d, %Y"),
+        }
+
+    def _request_params(self, opinion: Opinion, text: str = "") -> dict:
+        """``messages.create`` arguments for summarizing one opinion in a single request."""
+        content = text or opinion.text_content
+        # Without map-reduce, anything over the token budget is truncated
+        max_chars = SUMMARY_TOKEN_BUDGET * CHARS_PER_TOKEN
+        if len(content) > max_chars:
+            content = content[:max_chars] + "\n\n[... remainder truncated for summarization ...]"
+        return self._params(SUMMARY_USER_PROMPT.format(**self._case_fields(opinion), text=content))
+
+    def _needs_chunking(self, text: str) -> bool:
+        return self.map_reduce and estimate_tokens(text) > SUMMARY_TOKEN_BUDGET
+
+    def _map_reduce_summary(self, opinion: Opinion, text: str) -> str:
+        """Summarize a long opinion section by section, then combine the section summaries."""
+        tokens = estimate_tokens(text)
+        # Chunks grow past SUMMARY_CHUNK_TOKENS when needed to stay near SUMMARY_MAX_CHUNKS requests
+        chunk_tokens = max(SUMMARY_CHUNK_TOKENS, -(-tokens // SUMMARY_MAX_CHUNKS))
+        chunks = split_sections(text, chunk_tokens * CHARS_PER_TOKEN)
+        logger.info(f"{opinion.case_number}: ~{tokens} tokens, summarizing {len(chunks)} parts separately")
+        with self._usage_lock:
+            self.usage["map_reduce_summaries"] += 1
+
+        def summarize_part(part: int, chunk: str) -> str:
+            prompt = CHUNK_USER_PROMPT.format(
+                **self._case_fields(opinion), part=part, parts=len(chunks), text=chunk
+            )
+            return self._request_summary(opinion, self._params(prompt))
+
+        # The concurrency limiter bounds these together with every other request in flight
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self.max_concurrency), thread_name_prefix="part") as pool:
+            parts = list(pool.map(summarize_part, range(1, len(chunks) + 1), chunks))
+        if not all(parts):
+            return ""
+
+        combined = "\n\n".join(f"Part {i} of {len(parts)}: {summary}" for i, summary in enumerate(parts, 1))
+        return self._request_summary(
+            opinion, self._params(REDUCE_USER_PROMPT.format(**self._case_fields(opinion), text=combined))
+        )
+
+    def _system_prompt(self) -> str | list[dict]:
+        if not self.prompt_caching or self.few_shot_examples:
+            return SUMMARY_SYSTEM_PROMPT
+        return [{"type": "text", "text": SUMMARY_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+    def _few_shot_messages(self) -> list[dict]:
+        """Few-shot turns; with caching, the breakpoint on the last one caches system prompt + examples."""
+        messages = []
+        for example, summary in self.few_shot_examples:
+            messages.append({"role": "user", "content": example})
+            messages.append({"role": "assistant", "content": summary})
+        if messages and self.prompt_caching:
+            messages[-1]["content"] = [
+                {"type": "text", "text": messages[-1]["content"], "cache_control": {"type": "ephemeral"}}
+            ]
+        return messages
+
+    def _summary_key(self, opinion: Opinion, text: str = "") -> str | None:
+        """Memo key for an opinion's text, or None if the text is too short to memoize."""
+        text = text or opinion.text_content
+        # Short boilerplate ("Petition ... denied.") is shared by unrelated cases,
+        # whose summaries name the parties; it is cheap to summarize anyway
+        if len(text.strip()) < SUMMARY_CACHE_MIN_CHARS:
+            return None
+        return summary_key(text, self.model, PROMPT_VERSION)
+
+    def _cached_summary(self, opinion: Opinion, text: str = "") -> tuple[str | None, str | None]:
+        """``(memoized summary or None, cache key or None)`` for an opinion's text."""
+        key = self._summary_key(opinion, text)
+        if self.summary_cache is None or key is None:
+            return None, key
+        return self.summary_cache.get(key), key
+
+    def _remember_summary(self, key: str | None, summary: str):
+        if self.summary_cache is not None and key is not None and summary:
+            self.summary_cache.put(key, summary)
+
+    def _templated_summary(self, opinion: Opinion, text: str = "") -> str | None:
+        """Templated summary if the opinion is boilerplate (PCA, dismissal, ...), else None."""
+        if not self.rule_based:
+            return None
+        kind = classify_opinion(opinion, text)
+        if kind is None:
+            return None
+        with self._usage_lock:
+            self.usage["templated_summaries"] += 1
+        logger.info(f"{opinion.case_number}: {kind}, using a templated summary")
+        return templated_summary(opinion, kind, text)
+
+    def _record_usage(self, usage):
+        with self._usage_lock:
+            self.usage["input_tokens"] += usage.input_tokens or 0
+            self.usage["output_tokens"] += usage.output_tokens or 0
+            self.usage["cache_read_input_tokens"] += getattr(usage, "cache_read_input_tokens", None) or 0
+            self.usage["cache_creation_input_tokens"] += getattr(usage, "cache_creation_input_tokens", None) or 0
+
+    def log_usage(self):
+        """Log the token totals (including prompt-cache reads and writes) so far."""
+        usage = self.usage
+        logger.info(
+            f"Claude usage: {usage['input_tokens']} input tokens, {usage['output_tokens']} output tokens, "
+            f"{usage['cache_read_input_tokens']} read from prompt cache, "
+            f"{usage['cache_creation_input_tokens']} written to prompt cache"
+            + (f"; {self.summary_cache.hits} summaries reused from the summary cache" if self.summary_cache else "")
+            + f"; {usage['templated_summaries']} templated summaries"
+            + f"; {usage['map_reduce_summaries']} long opinions summarized in parts"
+        )
 
     def summarize_opinion(self, opinion: Opinion, text: str = "") -> str:
-        """Generate a summary for a single opinion."""
+        """Generate a summary for a single opinion ("" if the API call fails, so it is retried next run)."""
+        templated = self._templated_summary(opinion, text)
+        if templated:
+            return templated
         if not text and not opinion.text_content:
-            return f"[{opinion.court_name}] {opinion.case_number} — No opinion text available for summarization."
+            return self._no_text_summary(opinion)
 
+        key = self._summary_key(opinion, text)
+        if key is None:
+            return self._generate_summary(opinion, text)
+        # Concurrent requests for the same text wait for the first one, then hit the cache
+        with self._key_locks_lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached, _ = self._cached_summary(opinion, text)
+            if cached:
+                return cached
+            summary = self._generate_summary(opinion, text)
+            self._remember_summary(key, summary)
+            return summary
+
+    def _generate_summary(self, opinion: Opinion, text: str = "") -> str:
         content = text or opinion.text_content
-        # Truncate to ~12k chars to stay within reasonable token limits
-        if len(content) > 12000:
-            content = content[:12000] + "\n\n[... remainder truncated for summarization ...]"
-
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=500,
-                system=SUMMARY_SYSTEM_PROMPT,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": SUMMARY_USER_PROMPT.format(
-                            court_name=opinion.court_name,
-                            case_number=opinion.case_number,
-                            case_name=opinion.case_name,
-                            date=opinion.date.strftime("%B %d, %Y"),
-                            text=content,
-                        ),
-                    }
-                ],
-            )
-            return message.content[0].text.strip()
-        except Exception as e:
-            logger.error(f"Error summarizing {opinion.case_number}: {e}")
-            return f"Summary unavailable for {opinion.case_number}."
+        if self._needs_chunking(content):
+            return self._map_reduce_summary(opinion, content)
+        return self._request_summary(opinion, self._request_params(opinion, text))
+
+    def _request_summary(self, opinion: Opinion, params: dict) -> str:
+        """Send one summary request, retrying on rate limits and transient errors ("" on failure)."""
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                # The raw response exposes the rate-limit headers the limiter adapts to
+                response = self.client.messages.with_raw_response.create(**params)
+                self.limiter.observe(response.headers)
+                message = response.parse()
+                self._record_usage(message.usage)
+                return message.content[0].text.strip()
+            except (RateLimitError, InternalServerError, APIConnectionError) as e:
+                # 429s, overloaded/5xx responses and dropped connections all back off every caller
+                response = getattr(e, "response", None)
+                retry_after = parse_retry_after(response.headers.get("retry-after")) if response is not None else None
+                delay = self.limiter.backoff(attempt, retry_after)
+                logger.warning(f"{type(e).__name__} summarizing {opinion.case_number}; retrying in {delay:.1f}s")
+                self.limiter.pause(delay)
+            except Exception as e:
+                logger.error(f"Error summarizing {opinion.case_number}: {e}")
+                return ""
+            finally:
+                self.limiter.release()
+        logger.error(f"Giving up on {opinion.case_number} after {MAX_RETRIES + 1} attempts")
+        return ""
 
     def summarize_opinions(
-        self, opinions: list[Opinion], scraper: FloridaCourtScraper | None = None
+        self, opinions: Iterable[Opinion], scraper: FloridaCourtScraper | None = None
     ) -> list[Opinion]:
-        """Summarize a list of opinions, extracting PDF text as needed."""
+        """
+        Summarize opinions, extracting PDF text as needed.
+
+        ``opinions`` may be a generator (e.g. fed by ``iter_opinions``), in
+        which case each opinion is summarized as soon as it arrives.
+        """
+        return list(self.iter_summaries(opinions, scraper))
+
+    def iter_summaries(
+        self, opinions: Iterable[Opinion], scraper: FloridaCourtScraper | None = None
+    ) -> Iterator[Opinion]:
+        """
+        Like ``summarize_opinions``, but yields each opinion as soon as it (and
+        every opinion before it) is summarized.
+
+        Up to ``max_concurrency`` opinions are summarized at once; the input is
+        read at most twice that far ahead.
+        """
         if scraper is None:
             scraper = FloridaCourtScraper()
 
-        total = len(opinions)
-        for i, opinion in enumerate(opinions):
+        total = len(opinions) if hasattr(opinions, "__len__") else "?"
+
+        def summarize(i: int, opinion: Opinion) -> Opinion:
             logger.info(
                 f"Summarizing [{i+1}/{total}]: {opinion.court_name} - {opinion.case_number}"
             )
@@ -97,16 +366,169 @@ class OpinionSummarizer:
             # Extract text if not already present
             if not opinion.text_content and opinion.pdf_url:
                 opinion.text_content = scraper.extract_pdf_text(opinion)
-                time.sleep(1)  # Rate limit PDF downloads
 
             # Generate summary
             opinion.summary = self.summarize_opinion(opinion)
-            time.sleep(0.5)  # Rate limit API calls
+            return opinion
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="summarize") as pool:
+            for i, opinion in enumerate(opinions):
+                pending.append(pool.submit(summarize, i, opinion))
+                while pending and (pending[0].done() or len(pending) >= 2 * self.max_concurrency):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        if self.summary_cache is not None:
+            self.summary_cache.flush()
 
+    def summarize_batch(
+        self,
+        opinions: Iterable[Opinion],
+        scraper: FloridaCourtScraper | None = None,
+        deadline: float = SUMMARY_BATCH_DEADLINE,
+        poll_interval: float = SUMMARY_BATCH_POLL_INTERVAL,
+    ) -> list[Opinion]:
+        """
+        Summarize opinions through the Message Batches API.
+
+        All opinions with text go out as one batch, which is polled until it
+        ends or ``deadline`` seconds pass. Results are matched back to their
+        opinion by ``custom_id``. If the deadline passes the batch is
+        canceled; once it has ended, results that already succeeded are kept,
+        and anything without a summary (canceled, errored or expired
+        requests) is summarized synchronously instead.
+        """
+        if scraper is None:
+            scraper = FloridaCourtScraper()
+
+        opinions = list(opinions)
+        requests = []
+        by_custom_id = {}
+        cache_keys = {}
+        long_opinions = []
+        for i, opinion in enumerate(opinions):
+            if not opinion.text_content and opinion.pdf_url:
+                opinion.text_content = scraper.extract_pdf_text(opinion)
+            templated = self._templated_summary(opinion)
+            if templated:
+                opinion.summary = templated
+                continue
+            if not opinion.text_content:
+                opinion.summary = self._no_text_summary(opinion)
+                continue
+            cached, key = self._cached_summary(opinion)
+            if cached:
+                opinion.summary = cached
+                continue
+            if self._needs_chunking(opinion.text_content):
+                long_opinions.append(opinion)  # takes several dependent requests; done synchronously
+                continue
+            custom_id = _batch_custom_id(i, opinion.unique_id)
+            by_custom_id[custom_id] = opinion
+            cache_keys[custom_id] = key
+            requests.append({"custom_id": custom_id, "params": self._request_params(opinion)})
+
+        if requests:
+            started = time.monotonic()
+            try:
+                batch = self.client.messages.batches.create(requests=requests)
+                logger.info(f"Submitted message batch {batch.id} with {len(requests)} opinions")
+                while batch.processing_status != "ended" and time.monotonic() - started < deadline:
+                    time.sleep(poll_interval)
+                    batch = self.client.messages.batches.retrieve(batch.id)
+
+                if batch.processing_status != "ended":
+                    logger.warning(f"Message batch {batch.id} missed the {deadline:.0f}s deadline; canceling")
+                    batch = self.client.messages.batches.cancel(batch.id)
+                    # Requests that finished before the cancel are paid for; wait to collect them
+                    canceled = time.monotonic()
+                    while batch.processing_status != "ended" and time.monotonic() - canceled < SUMMARY_BATCH_CANCEL_WAIT:
+                        time.sleep(min(poll_interval, SUMMARY_BATCH_CANCEL_WAIT))
+                        batch = self.client.messages.batches.retrieve(batch.id)
+
+                if batch.processing_status == "ended":
+                    for entry in self.client.messages.batches.results(batch.id):
+                        opinion = by_custom_id.get(entry.custom_id)
+                        if opinion is not None and entry.result.type == "succeeded":
+                            opinion.summary = entry.result.message.content[0].text.strip()
+                            self._record_usage(entry.result.message.usage)
+                            self._remember_summary(cache_keys[entry.custom_id], opinion.summary)
+                    logger.info(f"Message batch {batch.id} ended after {time.monotonic() - started:.0f}s")
+                else:
+                    logger.warning(f"Message batch {batch.id} still had not ended {SUMMARY_BATCH_CANCEL_WAIT}s after canceling")
+            except Exception as e:
+                logger.error(f"Message batch failed: {e}")
+
+        leftovers = [o for o in by_custom_id.values() if not o.summary] + long_opinions
+        if leftovers:
+            logger.info(f"Summarizing {len(leftovers)} opinions without a batch result synchronously")
+            for _ in self.iter_summaries(leftovers, scraper):
+                pass
+        if self.summary_cache is not None:
+            self.summary_cache.flush()
         return opinions
 
 
-def summarize_all(opinions: list[Opinion], api_key: str | None = None) -> list[Opinion]:
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+# Line starts that open a new section: Roman-numeral or lettered headings, or
+# the usual all-caps section titles
+_SECTION_START_RE = re.compile(
+    r"\n(?=[ \t]*(?:[IVX]+\.|[A-H]\.)[ \t]+[A-Z]"
+    r"|[ \t]*(?:BACKGROUND|FACTS|ANALYSIS|DISCUSSION|STANDARD OF REVIEW|CONCLUSION)\b)"
+)
+
+
+def split_sections(text: str, max_chars: int) -> list[str]:
+    """
+    Split opinion text into chunks of at most ``max_chars``.
+
+    Cuts prefer section headings, then paragraph breaks; consecutive pieces
+    are packed together up to ``max_chars``. Only a single paragraph longer
+    than ``max_chars`` is cut mid-text.
+    """
+    pieces = []
+    for section in _SECTION_START_RE.split(text):
+        if len(section) <= max_chars:
+            pieces.append(section)
+            continue
+        for paragraph in re.split(r"\n\s*\n", section):
+            while len(paragraph) > max_chars:
+                pieces.append(paragraph[:max_chars])
+                paragraph = paragraph[max_chars:]
+            pieces.append(paragraph)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _batch_custom_id(index: int, unique_id: str) -> str:
+    """Batch ``custom_id`` for an opinion (must match ``^[a-zA-Z0-9_-]{1,64}$``)."""
+    return f"{index}-{re.sub(r'[^a-zA-Z0-9_-]', '_', unique_id)}"[:64]
+
+
+def summarize_all(opinions: Iterable[Opinion], api_key: str | None = None) -> list[Opinion]:
     """Convenience function to summarize a list of opinions."""
     summarizer = OpinionSummarizer(api_key=api_key)
     return summarizer.summarize_opinions(opinions)
+
+
+def iter_summaries(opinions: Iterable[Opinion], api_key: str | None = None) -> Iterator[Opinion]:
+    """Convenience function to summarize opinions as a stream."""
+    summarizer = OpinionSummarizer(api_key=api_key)
+    return summarizer.iter_summaries(opinions)
@@ -0,0 +1,87 @@
+"""
+Memoized summaries, keyed by what the model actually sees.
+
+The key is a hash of the normalized opinion text plus the model and prompt
+version, so the same text filed again under a different ID (re-issued
+opinions, corrected dockets) reuses the earlier summary instead of paying for
+another call. Texts shorter than ``SUMMARY_CACHE_MIN_CHARS`` are never
+memoized: short boilerplate is shared by unrelated cases. Entries expire
+after a TTL and the least recently used ones are evicted beyond a size cap.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def summary_key(text: str, model: str, prompt_version: str) -> str:
+    """Cache key for summarizing ``text`` (whitespace-normalized) with a model and prompt version."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model}\0{prompt_version}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """JSON file of summaries by key, with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable summary cache: {e}")
+            return {}
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry["created"] > self.ttl_seconds:
+                del self._entries[key]
+                self._dirty = True
+                return None
+            entry["last_used"] = now
+            self.hits += 1
+            self._dirty = True
+            return entry["summary"]
+
+    def put(self, key: str, summary: str):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {"summary": summary, "created": now, "last_used": now}
+            self._dirty = True
+            if len(self._entries) > self.max_entries:
+                by_use = sorted(self._entries, key=lambda k: self._entries[k]["last_used"])
+                for old_key in by_use[:len(self._entries) - self.max_entries]:
+                    del self._entries[old_key]
+
+    def flush(self):
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
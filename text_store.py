@@ -0,0 +1,148 @@
+"""
+Local store of full opinion text.
+
+Text (from the API or extracted from a PDF) is kept as compressed blobs named
+by the SHA-256 of the text, with a JSON index mapping CourtListener cluster
+ids to blob hashes. Re-summarization, backfills and feed rebuilds can then
+read an opinion's text from disk instead of asking CourtListener again, and
+identical texts filed under different clusters share one blob. The store is
+bounded in size: on flush, the least recently used blobs (and the index
+entries pointing at them) are evicted.
+
+Blobs are zstd-compressed when ``zstandard`` is installed, zlib otherwise.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Content hash used to name text blobs."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TextStore:
+    """Compressed opinion texts on disk, indexed by cluster id and content hash."""
+
+    def __init__(self, store_dir: str, max_bytes: int | None = None):
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(store_dir, "blobs")
+        self.index_path = os.path.join(store_dir, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable text store index: {e}")
+            return {}
+
+    def _blob_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.blob_dir, f"{digest}.{suffix}")
+
+    def get(self, cluster_id: str) -> tuple[str, str] | None:
+        """Return ``(text, source)`` stored for a cluster, if any."""
+        with self._lock:
+            entry = self._index.get(cluster_id)
+            if entry:
+                entry["last_used"] = time.time()
+                self._dirty = True
+        if not entry:
+            return None
+        text = self.get_by_hash(entry["hash"])
+        if text is None:
+            return None
+        return text, entry["source"]
+
+    def get_by_hash(self, digest: str) -> str | None:
+        """Return the text with the given content hash, if stored."""
+        for suffix, decompress in _CODECS:
+            try:
+                with open(self._blob_path(digest, suffix), "rb") as f:
+                    return decompress(f.read()).decode("utf-8")
+            except FileNotFoundError:
+                continue
+        return None
+
+    def put(self, cluster_id: str, text: str, source: str) -> str:
+        """Store a cluster's text (deduplicated by content hash) and return the hash."""
+        digest = text_hash(text)
+        path = self._blob_path(digest, _BLOB_SUFFIX)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.tmp.{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                f.write(_compress(text.encode("utf-8")))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._index[cluster_id] = {"hash": digest, "source": source, "last_used": time.time()}
+            self._dirty = True
+        return digest
+
+    def flush(self):
+        """Evict past the size cap, then write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._evict()
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        # A blob is as recently used as the most recent cluster pointing at it
+        last_used = {}
+        for entry in self._index.values():
+            last_used[entry["hash"]] = max(last_used.get(entry["hash"], 0), entry.get("last_used", 0))
+        blobs = [(e.name, e.stat().st_size) for e in os.scandir(self.blob_dir) if e.is_file()]
+        total = sum(size for _, size in blobs)
+        evicted = set()
+        for name, size in sorted(blobs, key=lambda blob: last_used.get(blob[0].split(".")[0], 0)):
+            if total <= self.max_bytes:
+                break
+            total -= size
+            evicted.add(name.split(".")[0])
+            try:
+                os.remove(os.path.join(self.blob_dir, name))
+            except OSError:
+                pass
+        if evicted:
+            self._index = {cid: e for cid, e in self._index.items() if e["hash"] not in evicted}
+            logger.info(f"Text store: evicted {len(evicted)} texts past the {self.max_bytes} byte cap")
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Suffix new blobs are written with, and every (suffix, decompressor) we can read
+_BLOB_SUFFIX = "zst" if zstandard is not None else "zz"
+_CODECS = ([("zst", _zstd_decompress)] if zstandard is not None else []) + [("zz", zlib.decompress)]